@@ -0,0 +1,200 @@
+"""
+Simply Note It - Batch mode
+Applies find/replace, line transforms and macros to many files at once,
+using the editor's line transforms and without loading tkinter. Replace
+is transforms.replace_all; the editor has no replace dialog to share.
+
+    python3 main_simple.py --batch --transform trim --replace foo bar src/
+    python3 main_simple.py --batch --macro cleanup.json --include "*.py" .
+
+A macro is a JSON list of steps, applied in order:
+
+    [{"transform": "trim"},
+     {"replace": "foo", "with": "bar", "regex": false, "ignore_case": false}]
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import transforms
+
+# Transforms that reorder or drop whole lines; the rest rewrite each line in place
+REORDERING = {"sort", "unique"}
+
+_line_ending = re.compile("(\r\n|\n|\r)")
+
+
+class StepAction(argparse.Action):
+    """Collect --replace and --transform steps in the order they were given"""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        steps = getattr(namespace, "steps", None) or []
+        if option_string == "--transform":
+            steps.append({"transform": values})
+        else:
+            steps.append({"replace": values[0], "with": values[1]})
+        namespace.steps = steps
+
+
+def load_macro(path):
+    """Read a macro file into a list of steps"""
+    with open(path, "r", encoding="utf-8") as file:
+        steps = json.load(file)
+    for step in steps:
+        if "transform" in step and step["transform"] not in transforms.TRANSFORMS:
+            raise ValueError(f"Unknown transform in macro: {step['transform']}")
+        if "transform" not in step and "replace" not in step:
+            raise ValueError(f"Macro step needs 'transform' or 'replace': {step}")
+        if "transform" not in step and step.get("regex"):
+            # re.error is not a ValueError; report it here rather than once per file
+            try:
+                re.compile(step["replace"])
+            except re.error as e:
+                raise ValueError(f"Bad regex in macro: {step['replace']!r}: {e}")
+    return steps
+
+
+def transform_keeping_endings(name, text):
+    """Run a line transform over text whose lines may end in \\r\\n, \\n or \\r, keeping each line's own ending"""
+    pieces = _line_ending.split(text)
+    lines, endings = pieces[0::2], pieces[1::2] + [""]
+    trailing = len(lines) > 1 and not lines[-1]
+    if trailing:
+        lines.pop()
+        endings.pop()
+    present = [ending for ending in endings if ending]
+    default = max(set(present), key=present.count) if present else "\n"
+    endings = [ending or default for ending in endings]
+    result = transforms.TRANSFORMS[name](lines)
+    if name in REORDERING:
+        # Endings travel with their lines
+        pool = {}
+        for line, ending in zip(lines, endings):
+            pool.setdefault(line, []).append(ending)
+        endings = [pool[line].pop(0) for line in result]
+    if not trailing and result:
+        endings[len(result) - 1] = ""
+    return "".join(line + ending for line, ending in zip(result, endings))
+
+
+def apply_steps(text, steps):
+    """Run every step over text, returning (text, number of replacements)"""
+    replacements = 0
+    for step in steps:
+        if "transform" in step:
+            text = transform_keeping_endings(step["transform"], text)
+        else:
+            text, count = transforms.replace_all(
+                text,
+                step["replace"],
+                step.get("with", ""),
+                regex=step.get("regex", False),
+                ignore_case=step.get("ignore_case", False),
+            )
+            replacements += count
+    return text, replacements
+
+
+def write_atomic(path, text):
+    """Write to a temporary file next to path and rename it into place"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".snit-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def process_file(path, steps, dry_run=False):
+    """Apply steps to one file; returns (path, changed, replacements, error)"""
+    try:
+        # Untranslated, so every line keeps its own ending
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            text = file.read()
+        result, replacements = apply_steps(text, steps)
+        changed = result != text
+        if changed and not dry_run:
+            write_atomic(path, result)
+        return path, changed, replacements, None
+    except (OSError, UnicodeDecodeError, ValueError, re.error) as e:
+        # re.error still comes from replacements, e.g. a group the regex does not have
+        return path, False, 0, str(e)
+
+
+def collect_files(paths, include):
+    """Expand directories and filter by the include patterns"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [name for name in dirs if not name.startswith(".")]
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+    if include:
+        files = [
+            path for path in files
+            if any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in include)
+        ]
+    return files
+
+
+def main(argv):
+    """Entry point for --batch; returns the process exit code"""
+    parser = argparse.ArgumentParser(prog="main_simple.py --batch", description="Edit many files without the GUI")
+    parser.add_argument("paths", nargs="+", help="files or directories to edit")
+    parser.add_argument("--replace", nargs=2, metavar=("FIND", "REPLACE"), action=StepAction, help="replace text")
+    parser.add_argument("--transform", choices=sorted(transforms.TRANSFORMS), action=StepAction, help="apply a line transform")
+    parser.add_argument("--macro", help="JSON file with a list of steps")
+    parser.add_argument("--include", action="append", help="only edit files matching this pattern")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    args = parser.parse_args(argv)
+
+    steps = list(getattr(args, "steps", None) or [])
+    if args.macro:
+        try:
+            steps.extend(load_macro(args.macro))
+        except (OSError, ValueError) as e:
+            parser.error(f"could not load macro: {e}")
+    if not steps:
+        parser.error("nothing to do: give --replace, --transform or --macro")
+
+    files = collect_files(args.paths, args.include)
+    jobs = max(1, min(args.jobs or 1, len(files)))
+    if jobs == 1:
+        results = [process_file(path, steps, args.dry_run) for path in files]
+    else:
+        # Fork where we can so workers never re-import the GUI module
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        chunksize = max(1, len(files) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+            results = list(executor.map(
+                process_file, files, [steps] * len(files), [args.dry_run] * len(files), chunksize=chunksize
+            ))
+
+    changed = errors = 0
+    for path, was_changed, replacements, error in results:
+        if error:
+            errors += 1
+            print(f"error: {path}: {error}", file=sys.stderr)
+        elif was_changed:
+            changed += 1
+            print(f"{'would change' if args.dry_run else 'changed'}: {path} ({replacements} replacements)")
+    print(f"{len(files)} files, {changed} changed, {errors} errors")
+    return 1 if errors else 0
@@ -0,0 +1,48 @@
+"""
+Simply Note It - Clipboard
+Large pastes are cut into slices for time-sliced insertion, and large
+copies are kept as one string that is handed out piece by piece when
+another application asks for it
+"""
+
+# Pastes and copies at or above this many characters take the slow-but-responsive path
+LARGE_PASTE = 1024 * 1024
+LARGE_COPY = 1024 * 1024
+
+# Characters per insert, and how long one slice of a paste may hold the UI
+PASTE_CHUNK = 256 * 1024
+PASTE_SLICE = 0.03
+
+
+def chunk_end(text, start, size=PASTE_CHUNK):
+    """End of the chunk starting at start, on a line break when there is one nearby"""
+    end = start + size
+    if end >= len(text):
+        return len(text)
+    # Whole lines keep Tk's line layout work per insert small
+    newline = text.rfind("\n", start + size // 2, end)
+    return newline + 1 if newline != -1 else end
+
+
+class LazyClipboard:
+    """Owns one copied string and serves it in the pieces the requester asks for"""
+
+    def __init__(self):
+        self.text = None
+
+    def set(self, text):
+        self.text = text
+
+    def clear(self):
+        """Ownership went to someone else; let the string go"""
+        self.text = None
+
+    def owns(self):
+        return self.text is not None
+
+    def serve(self, offset, length):
+        """Selection handler: length characters from offset"""
+        if self.text is None:
+            return ""
+        offset = int(offset)
+        return self.text[offset:offset + int(length)]
@@ -0,0 +1,127 @@
+"""
+Simply Note It - Python diagnostics
+Syntax errors, compiler warnings and a few lint checks for a source
+snapshot. check() is meant to run in a worker process.
+"""
+
+import ast
+import warnings
+
+ERROR = "error"
+WARNING = "warning"
+
+
+def _column(lines, line, byte_offset):
+    """ast columns are UTF-8 byte offsets; Tk wants characters"""
+    if not 0 < line <= len(lines):
+        return byte_offset
+    return len(lines[line - 1].encode("utf-8")[:byte_offset].decode("utf-8", "ignore"))
+
+
+def _node_span(lines, node):
+    line = node.lineno
+    end_line = getattr(node, "end_lineno", None) or line
+    column = _column(lines, line, node.col_offset)
+    end_offset = getattr(node, "end_col_offset", None)
+    end_column = _column(lines, end_line, end_offset) if end_offset is not None else None
+    return line, column, end_line, end_column
+
+
+class _Linter(ast.NodeVisitor):
+    """Cheap checks that need no imports or type information"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.found = []
+        self.imports = {}  # name -> import node, module level only
+        self.used = set()
+
+    def report(self, node, message, severity=WARNING):
+        self.found.append((severity, *_node_span(self.lines, node), message))
+
+    def visit_Module(self, node):
+        for statement in node.body:
+            # __future__ imports change how the module compiles, so they are never unused
+            if isinstance(statement, ast.ImportFrom) and statement.module == "__future__":
+                continue
+            if isinstance(statement, (ast.Import, ast.ImportFrom)):
+                for alias in statement.names:
+                    if alias.name != "*":
+                        name = alias.asname or alias.name.split(".")[0]
+                        self.imports[name] = statement
+        self.check_redefinitions(node.body)
+        self.generic_visit(node)
+        for name, statement in self.imports.items():
+            if name not in self.used:
+                self.report(statement, f"'{name}' imported but unused")
+
+    def check_redefinitions(self, body):
+        seen = {}
+        for statement in body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                if statement.name in seen and not statement.decorator_list:
+                    self.report(statement, f"redefinition of '{statement.name}' from line {seen[statement.name]}")
+                seen[statement.name] = statement.lineno
+
+    def visit_ClassDef(self, node):
+        self.check_redefinitions(node.body)
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        self.used.add(node.id)
+
+    def visit_Global(self, node):
+        self.used.update(node.names)
+
+    def visit_ExceptHandler(self, node):
+        if node.type is None:
+            # Only the keyword, not the whole handler body
+            column = _column(self.lines, node.lineno, node.col_offset)
+            self.found.append((WARNING, node.lineno, column, node.lineno, column + len("except"),
+                               "bare 'except:' also catches KeyboardInterrupt and SystemExit"))
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        for operator, right in zip(node.ops, node.comparators):
+            if isinstance(operator, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant) and right.value is None:
+                self.report(node, "comparison to None should use 'is' or 'is not'")
+        self.generic_visit(node)
+
+    def visit_FormattedValue(self, node):
+        self.visit(node.value)
+        if node.format_spec is not None:
+            # A format spec like f"{x:>10}" is a JoinedStr too, but needs no placeholders
+            for value in node.format_spec.values:
+                self.visit(value)
+
+    def visit_JoinedStr(self, node):
+        if not any(isinstance(value, ast.FormattedValue) for value in node.values):
+            self.report(node, "f-string without any placeholders")
+        self.generic_visit(node)
+
+
+def check(source, filename="<buffer>"):
+    """Diagnostics as (severity, line, column, end line, end column or None, message), sorted"""
+    lines = source.split("\n")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        try:
+            tree = ast.parse(source, filename)
+            # Some errors (return outside function, bad nonlocal) only show up when compiling
+            compile(tree, filename, "exec")
+        except SyntaxError as e:
+            line = e.lineno or 1
+            column = max((e.offset or 1) - 1, 0)
+            end_line = getattr(e, "end_lineno", None) or line
+            end_offset = getattr(e, "end_offset", None)
+            end_column = end_offset - 1 if end_offset and end_offset - 1 > column else None
+            return [(ERROR, line, column, end_line, end_column, e.msg)]
+        except ValueError as e:  # Source with null bytes
+            return [(ERROR, 1, 0, 1, None, str(e))]
+    found = [(WARNING, warning.lineno or 1, 0, warning.lineno or 1, None, str(warning.message))
+             for warning in caught if issubclass(warning.category, SyntaxWarning)]
+    linter = _Linter(lines)
+    linter.visit(tree)
+    found.extend(linter.found)
+    found.sort(key=lambda diagnostic: (diagnostic[1], diagnostic[2]))
+    return found
@@ -0,0 +1,224 @@
+"""
+Simply Note It - Export
+Streaming HTML and PDF writers: documents are fed in chunks so memory stays
+flat no matter how big the file is
+"""
+
+import html
+
+# Lines read from the panel per chunk, and chunks allowed in flight
+CHUNK_LINES = 2000
+QUEUE_SIZE = 4
+
+# Tk tag options that have a CSS equivalent
+CSS_PROPERTIES = {
+    "background": "background-color",
+    "foreground": "color",
+}
+
+
+def css_rules(tag_styles):
+    """CSS rules for the tags we carry into HTML"""
+    rules = []
+    for tag, options in tag_styles.items():
+        declarations = [
+            f"{CSS_PROPERTIES[name]}: {value}"
+            for name, value in options.items()
+            if name in CSS_PROPERTIES
+        ]
+        if options.get("underline"):
+            declarations.append("text-decoration: underline")
+        if declarations:
+            rules.append(f".{tag} {{ {'; '.join(declarations)} }}")
+    return rules
+
+
+class HtmlExporter:
+    """Writes a <pre> document, wrapping tagged spans in <span class=...>"""
+
+    binary = False
+
+    def __init__(self, file, title, page_style=None, tag_styles=None):
+        self.file = file
+        self.title = title
+        self.page_style = page_style or {}
+        self.tag_styles = tag_styles or {}
+
+    def begin(self):
+        body = [
+            f"{CSS_PROPERTIES[name]}: {value}"
+            for name, value in self.page_style.items()
+            if name in CSS_PROPERTIES
+        ]
+        rules = [f"body {{ {'; '.join(body)} }}"] + css_rules(self.tag_styles)
+        self.file.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(self.title)}</title>\n"
+            "<style>\n" + "\n".join(rules) + "\n</style>\n"
+            "</head>\n<body>\n<pre>"
+        )
+
+    def write_chunk(self, text, spans=()):
+        """Write text, where spans are (start, end, tag) offsets into it"""
+        if not spans:
+            self.file.write(html.escape(text, quote=False))
+            return
+        # Sweep span boundaries, tagging each piece with whatever is active
+        events = sorted(
+            [(start, 1, tag) for start, _, tag in spans] +
+            [(end, -1, tag) for _, end, tag in spans]
+        )
+        active = {}
+        position = 0
+        for point, change, tag in events:
+            if point > position:
+                self._write_piece(text[position:point], active)
+                position = point
+            active[tag] = active.get(tag, 0) + change
+        self._write_piece(text[position:], active)
+
+    def _write_piece(self, piece, active):
+        if not piece:
+            return
+        piece = html.escape(piece, quote=False)
+        classes = [tag for tag, depth in active.items() if depth > 0]
+        if classes:
+            self.file.write(f"<span class=\"{' '.join(classes)}\">{piece}</span>")
+        else:
+            self.file.write(piece)
+
+    def end(self):
+        self.file.write("</pre>\n</body>\n</html>\n")
+
+
+class PdfExporter:
+    """
+    Minimal dependency-free PDF writer using the built-in Courier font.
+
+    Pages are written as soon as they fill up; only the byte offset of each
+    object is kept until the cross-reference table goes out at the end.
+    """
+
+    binary = True
+
+    PAGE_WIDTH = 612
+    PAGE_HEIGHT = 792
+    MARGIN = 36
+    FONT_SIZE = 9
+    LEADING = 11
+    TAB_WIDTH = 4
+
+    # Object numbers fixed up front; pages follow from FIRST_PAGE_OBJECT
+    CATALOG, PAGES, FONT = 1, 2, 3
+    FIRST_PAGE_OBJECT = 4
+
+    def __init__(self, file, title, page_style=None, tag_styles=None):
+        self.file = file
+        self.title = title
+        self.offsets = {}
+        self.position = 0
+        self.page_objects = []
+        self.lines = []
+        self.partial = ""
+        self.continued = False  # Rows of the line in partial were already laid out
+        self.lines_per_page = (self.PAGE_HEIGHT - 2 * self.MARGIN) // self.LEADING
+        # Courier glyphs are 0.6em wide
+        self.columns = int((self.PAGE_WIDTH - 2 * self.MARGIN) / (self.FONT_SIZE * 0.6))
+
+    def _write(self, data):
+        self.file.write(data)
+        self.position += len(data)
+
+    def _object(self, number, body):
+        self.offsets[number] = self.position
+        self._write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def begin(self):
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode("ascii"))
+        self._object(self.FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    def write_chunk(self, text, spans=()):
+        """Lay text out into lines and flush every full page"""
+        pieces = (self.partial + text).split("\n")
+        self.partial = pieces.pop()
+        for line in pieces:
+            if line or not self.continued:
+                self._add_line(line)
+            self.continued = False
+        if len(self.partial) > self.columns:
+            # No newline in sight: lay out the full rows now so memory stays flat.
+            # Rows are whole tab stops wide, so expanding the rest later lines up
+            partial = self.partial.expandtabs(self.TAB_WIDTH)
+            cut = len(partial) - len(partial) % self.columns
+            self._add_line(partial[:cut])
+            self.partial = partial[cut:]
+            self.continued = True
+
+    def _add_line(self, line):
+        line = line.expandtabs(self.TAB_WIDTH)
+        for start in range(0, max(len(line), 1), self.columns):
+            self.lines.append(line[start:start + self.columns])
+            if len(self.lines) == self.lines_per_page:
+                self._flush_page()
+
+    @staticmethod
+    def _escape(line):
+        encoded = line.encode("cp1252", "replace")
+        return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    def _flush_page(self):
+        top = self.PAGE_HEIGHT - self.MARGIN - self.FONT_SIZE
+        content = [f"BT /F1 {self.FONT_SIZE} Tf {self.LEADING} TL {self.MARGIN} {top} Td".encode("ascii")]
+        for line in self.lines:
+            content.append(b"(" + self._escape(line) + b") Tj T*")
+        content.append(b"ET")
+        stream = b"\n".join(content)
+
+        contents_number = self.FIRST_PAGE_OBJECT + 2 * len(self.page_objects)
+        page_number = contents_number + 1
+        self._object(
+            contents_number,
+            f"<< /Length {len(stream)} >>\nstream\n".encode("ascii") + stream + b"\nendstream",
+        )
+        self._object(
+            page_number,
+            (
+                f"<< /Type /Page /Parent {self.PAGES} 0 R "
+                f"/MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {self.FONT} 0 R >> >> "
+                f"/Contents {contents_number} 0 R >>"
+            ).encode("ascii"),
+        )
+        self.page_objects.append(page_number)
+        self.lines = []
+
+    def end(self):
+        if self.partial:
+            self._add_line(self.partial)
+            self.partial = ""
+        if self.lines or not self.page_objects:
+            self._flush_page()
+        kids = " ".join(f"{number} 0 R" for number in self.page_objects)
+        self._object(
+            self.PAGES,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_objects)} >>".encode("ascii"),
+        )
+
+        xref_position = self.position
+        count = max(self.offsets) + 1
+        xref = [f"xref\n0 {count}\n0000000000 65535 f \n"]
+        for number in range(1, count):
+            xref.append(f"{self.offsets[number]:010d} 00000 n \n")
+        self._write("".join(xref).encode("ascii"))
+        self._write(
+            f"trailer\n<< /Size {count} /Root {self.CATALOG} 0 R >>\n"
+            f"startxref\n{xref_position}\n%%EOF\n".encode("ascii")
+        )
+
+
+EXPORTERS = {
+    ".html": HtmlExporter,
+    ".htm": HtmlExporter,
+    ".pdf": PdfExporter,
+}
@@ -0,0 +1,458 @@
+"""
+Simply Note It - File I/O
+Large read-ahead, cached stat and write-behind saves for slow mounts such
+as WSL's /mnt/c, where every syscall is a round trip to Windows, plus
+streaming .gz/.bz2/.xz support
+"""
+
+import bz2
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import queue
+import stat
+import threading
+import time
+
+# Reads are done in large blocks aligned to this size
+BLOCK_ALIGN = 64 * 1024
+READ_AHEAD = 4 * 1024 * 1024
+
+# How long a cached stat result is trusted
+STAT_TTL = 2.0
+
+# Compressed files stream in line-aligned chunks through a small queue;
+# a line with no newline in sight is passed on once it gets this long
+STREAM_CHUNK = 1024 * 1024
+STREAM_QUEUE = 4
+MAX_CARRY = 16 * 1024 * 1024
+
+# Characters put into a panel before the rest waits for "Load More"
+STREAM_LIMIT = 32 * 1024 * 1024
+
+COMPRESSION = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+# Under the user's own cache, never a shared temp directory: staged saves hold
+# file contents, and recover() writes them wherever their .json points
+STAGING_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                           "simply-note-it", "staging")
+
+
+def _owned_by_us(info):
+    return not hasattr(os, "getuid") or info.st_uid == os.getuid()
+
+
+def _private_dir(directory):
+    """Create directory if needed and make sure only we can use it"""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or not _owned_by_us(info) or \
+            (hasattr(os, "getuid") and stat.S_IMODE(info.st_mode) != 0o700):
+        raise PermissionError(f"Refusing staging directory {directory}: it must be a directory of ours with mode 0700")
+
+
+def _write_private(path, data):
+    """Create path afresh, never through a symlink, readable only by us, and fsync it"""
+    try:
+        os.unlink(path)  # A leftover from a crash
+    except FileNotFoundError:
+        pass
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    with os.fdopen(os.open(path, flags, 0o600), "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class LocalFS:
+    """The handful of filesystem calls the I/O layer makes"""
+
+    def open(self, path, mode="rb", buffering=-1):
+        return open(path, mode, buffering=buffering)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def replace(self, source, destination):
+        os.replace(source, destination)
+
+    def chmod(self, path, mode):
+        os.chmod(path, mode)
+
+    def unlink(self, path):
+        os.unlink(path)
+
+    def fsync(self, file):
+        os.fsync(file.fileno())
+
+
+class _SlowFile:
+    """File wrapper that sleeps on every read and write"""
+
+    def __init__(self, file, latency):
+        self._file = file
+        self._latency = latency
+
+    def read(self, *args):
+        time.sleep(self._latency)
+        return self._file.read(*args)
+
+    def readinto(self, buffer):
+        time.sleep(self._latency)
+        return self._file.readinto(buffer)
+
+    def write(self, data):
+        time.sleep(self._latency)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class SlowFS(LocalFS):
+    """
+    Adds latency to every call, to try the I/O layer against something
+    that behaves like a network or /mnt/c mount
+    """
+
+    def __init__(self, latency=0.01):
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def open(self, path, mode="rb", buffering=-1):
+        self._wait()
+        return _SlowFile(super().open(path, mode, buffering=0 if "b" in mode else buffering), self.latency)
+
+    def stat(self, path):
+        self._wait()
+        return super().stat(path)
+
+    def replace(self, source, destination):
+        self._wait()
+        super().replace(source, destination)
+
+    def chmod(self, path, mode):
+        self._wait()
+        super().chmod(path, mode)
+
+    def unlink(self, path):
+        self._wait()
+        super().unlink(path)
+
+    def fsync(self, file):
+        self._wait()
+        super().fsync(file)
+
+
+class StatCache:
+    """Remembers stat results for a short while"""
+
+    def __init__(self, fs=None, ttl=STAT_TTL):
+        self.fs = fs or LocalFS()
+        self.ttl = ttl
+        self.entries = {}
+
+    def stat(self, path):
+        """Cached stat; raises OSError like os.stat"""
+        now = time.monotonic()
+        entry = self.entries.get(path)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        result = self.fs.stat(path)
+        self.entries[path] = (now, result)
+        return result
+
+    def invalidate(self, path):
+        self.entries.pop(path, None)
+
+
+def is_slow_path(path):
+    """Whether path is on a Windows drive seen from WSL"""
+    path = os.path.abspath(path)
+    return _running_in_wsl() and path.startswith("/mnt/") and len(path) > 6 and path[6:7] in ("/", "")
+
+
+_wsl = None
+
+
+def _running_in_wsl():
+    global _wsl
+    if _wsl is None:
+        try:
+            with open("/proc/version", "r") as file:
+                _wsl = "microsoft" in file.read().lower()
+        except OSError:
+            _wsl = False
+    return _wsl
+
+
+def open_text(path, fs=None, stat_cache=None, encoding="utf-8"):
+    """Open a file for reading text with large aligned read-ahead"""
+    fs = fs or LocalFS()
+    size = (stat_cache or StatCache(fs)).stat(path).st_size
+    # Big enough to take small files in one read, capped for huge ones
+    buffer_size = min(max(size, 1), READ_AHEAD)
+    buffer_size = -(-buffer_size // BLOCK_ALIGN) * BLOCK_ALIGN
+    raw = fs.open(path, "rb", buffering=0)
+    return io.TextIOWrapper(io.BufferedReader(raw, buffer_size=buffer_size), encoding=encoding)
+
+
+def compression(path):
+    """Compression module for path's extension, or None"""
+    return COMPRESSION.get(os.path.splitext(path)[1].lower())
+
+
+def _compressor(path, file):
+    """Streaming compressor writing into file, or None for plain files"""
+    module = compression(path)
+    if module is gzip:
+        # No file name in the header; file is a temporary
+        return gzip.GzipFile(filename="", mode="wb", fileobj=file)
+    if module is not None:
+        return module.open(file, "wb")
+    return None
+
+
+class TextStream:
+    """
+    Decompresses a file on a background thread into a bounded queue of
+    text chunks that end on line breaks.
+
+    The reader blocks while the queue is full, so only as much of the file
+    is expanded as the consumer has taken. get() returns a chunk, None at
+    the end, or raises queue.Empty when nothing is ready yet.
+    """
+
+    def __init__(self, path, fs=None, stat_cache=None, encoding="utf-8"):
+        self.path = path
+        self.fs = fs or LocalFS()
+        self.encoding = encoding
+        self.size = (stat_cache or StatCache(self.fs)).stat(path).st_size
+        self.read_bytes = 0
+        self.error = None
+        self.chunks = queue.Queue(STREAM_QUEUE)
+        self.cancelled = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try:
+            with self.fs.open(self.path, "rb", buffering=0) as raw:
+                source = io.BufferedReader(raw, buffer_size=READ_AHEAD)
+                module = compression(self.path)
+                with (module.open(source, "rt", encoding=self.encoding) if module else
+                      io.TextIOWrapper(source, encoding=self.encoding)) as file:
+                    carry = ""
+                    while not self.cancelled.is_set():
+                        chunk = file.read(STREAM_CHUNK)
+                        if not chunk:
+                            break
+                        self.read_bytes = source.tell()
+                        text = carry + chunk
+                        cut = text.rfind("\n") + 1
+                        if cut == 0 and len(text) < MAX_CARRY:
+                            carry = text
+                            continue
+                        cut = cut or len(text)
+                        carry = text[cut:]
+                        self._put(text[:cut])
+                    if carry:
+                        self._put(carry)
+        except (OSError, EOFError, ValueError, lzma.LZMAError) as e:
+            self.error = e
+        self._put(None)
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def get(self):
+        return self.chunks.get_nowait()
+
+    def progress(self):
+        """Fraction of the file read so far"""
+        return self.read_bytes / self.size if self.size else 1.0
+
+    def cancel(self):
+        """Stop reading and let the thread finish"""
+        self.cancelled.set()
+
+
+class WriteBehind:
+    """
+    Saves land in a local staging copy right away and are flushed to their
+    real path by a background thread, compressed on the way for .gz, .bz2
+    and .xz paths.
+
+    Once save() returns the data is on local disk (fsynced), and a staging
+    copy is only removed after its destination has been written, fsynced and
+    renamed into place. recover() re-queues anything left over from a crash.
+    """
+
+    def __init__(self, fs=None, staging_dir=STAGING_DIR, stat_cache=None):
+        self.fs = fs or LocalFS()
+        self.staging_dir = staging_dir
+        self.stat_cache = stat_cache
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending = {}  # destination -> (staging path, generation)
+        self.generation = 0
+        self.errors = {}
+        self.idle = threading.Event()
+        self.idle.set()
+        self.thread = None
+
+    def _staging_path(self, path):
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.staging_dir, name)
+
+    def save(self, path, data):
+        """Stage bytes for path and queue them to be flushed"""
+        path = os.path.abspath(path)
+        _private_dir(self.staging_dir)
+        staging = self._staging_path(path)
+        _write_private(staging + ".tmp", data)
+        _write_private(staging + ".json.tmp", json.dumps({"path": path}).encode("utf-8"))
+        # Staged and queued under the lock, so a flush finishing in between
+        # cannot take the new copy for its own and discard it
+        with self.lock:
+            os.replace(staging + ".tmp", staging)
+            os.replace(staging + ".json.tmp", staging + ".json")
+            already_queued = self._queue_locked(path, staging)
+        self._start(path, already_queued)
+
+    def _queue(self, path, staging):
+        with self.lock:
+            already_queued = self._queue_locked(path, staging)
+        self._start(path, already_queued)
+
+    def _queue_locked(self, path, staging):
+        # A newer save of the same file replaces the staged copy; the
+        # flusher notices the generation change and goes round again
+        already_queued = path in self.pending
+        self.generation += 1
+        self.pending[path] = (staging, self.generation)
+        self.errors.pop(path, None)
+        self.idle.clear()
+        return already_queued
+
+    def _start(self, path, already_queued):
+        if not already_queued:
+            self.jobs.put(path)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            path = self.jobs.get()
+            with self.lock:
+                entry = self.pending.get(path)
+            error = None
+            if entry is not None:
+                try:
+                    self._flush(path, entry[0])
+                except OSError as e:
+                    error = e
+            with self.lock:
+                if entry is None:
+                    pass
+                elif error is not None:
+                    # The staged copy stays on disk for recover()
+                    self.errors[path] = error
+                    self.pending.pop(path, None)
+                elif self.pending.get(path) == entry:
+                    del self.pending[path]
+                    self._discard(entry[0])
+                else:
+                    self.jobs.put(path)
+                if not self.pending:
+                    self.idle.set()
+
+    def _flush(self, path, staging):
+        directory = os.path.dirname(path)
+        temp = os.path.join(directory, f".{os.path.basename(path)}.snit-tmp")
+        try:
+            mode = stat.S_IMODE(self.fs.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = None  # A new file gets the umask default
+        with open(staging, "rb") as source, self.fs.open(temp, "wb") as target:
+            compressor = _compressor(path, target)
+            while True:
+                block = source.read(READ_AHEAD)
+                if not block:
+                    break
+                (compressor or target).write(block)
+            if compressor is not None:
+                compressor.close()  # Writes the trailer, leaves target open
+            target.flush()
+            self.fs.fsync(target)
+        if mode is not None:
+            # The replace would otherwise leave the file with the temp file's mode
+            self.fs.chmod(temp, mode)
+        self.fs.replace(temp, path)
+        if self.stat_cache is not None:
+            self.stat_cache.invalidate(path)
+
+    def _discard(self, staging):
+        for name in (staging, staging + ".json"):
+            try:
+                os.unlink(name)
+            except OSError:
+                pass
+
+    def recover(self):
+        """Queue staged saves left behind by an editor that did not finish flushing"""
+        try:
+            _private_dir(self.staging_dir)
+            names = os.listdir(self.staging_dir)
+        except OSError:
+            return []
+        recovered = []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            staging = os.path.join(self.staging_dir, name[:-5])
+            try:
+                # Only regular files of ours; anything else was not staged by us
+                if not all(stat.S_ISREG(info.st_mode) and _owned_by_us(info)
+                           for info in (os.lstat(staging + ".json"), os.lstat(staging))):
+                    continue
+                with open(staging + ".json", "r", encoding="utf-8") as file:
+                    path = json.load(file)["path"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if isinstance(path, str) and staging == self._staging_path(path):
+                self._queue(path, staging)
+                recovered.append(path)
+        return recovered
+
+    def is_flushing(self, path):
+        with self.lock:
+            return os.path.abspath(path) in self.pending
+
+    def take_errors(self):
+        """Errors since the last call, as {path: exception}"""
+        with self.lock:
+            errors, self.errors = self.errors, {}
+        return errors
+
+    def wait(self, timeout=None):
+        """Block until every staged save has been flushed"""
+        return self.idle.wait(timeout)
@@ -0,0 +1,186 @@
+"""
+Simply Note It - Code folding
+Fold regions come from indentation and brackets. Per-line indent and
+bracket depth live in arrays; an update re-scans only the lines that
+changed, plus the lines after them whose bracket depth shifted, and
+only the regions between the top-level lines around those.
+"""
+
+import bisect
+import re
+from array import array
+
+TAB_SIZE = 8
+
+# Brackets outside simple quoted strings
+_tokens = re.compile(r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|[()\[\]{}]""")
+_brackets = re.compile(r"[()\[\]{}]")
+
+
+def line_info(line):
+    """(indent width or -1 for a blank line, net bracket change)"""
+    stripped = line.lstrip(" \t")
+    if not stripped:
+        return -1, 0
+    indent = len(line) - len(stripped)
+    if "\t" in line[:indent]:
+        indent = len(line[:indent].expandtabs(TAB_SIZE))
+    if not _brackets.search(stripped):
+        return indent, 0
+    if "'" not in stripped and '"' not in stripped:
+        # No strings to skip: counting is enough
+        opened = stripped.count("(") + stripped.count("[") + stripped.count("{")
+        return indent, opened - stripped.count(")") - stripped.count("]") - stripped.count("}")
+    delta = 0
+    for token in _tokens.findall(stripped):
+        if token in "([{":
+            delta += 1
+        elif token in ")]}":
+            delta -= 1
+    return indent, delta
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix of two arrays, found with C-level slice compares"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class FoldIndex:
+    """Fold structure of one document"""
+
+    def __init__(self):
+        self.hashes = array("q")
+        self.indents = array("i")
+        self.deltas = array("i")
+        self.depths = array("i")  # Bracket depth at the start of each line
+        self._regions = []
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def update(self, text):
+        """Bring the index up to date with the whole text; returns the (first, last) 0-based lines re-scanned"""
+        lines = text.split("\n")
+        hashes = array("q", map(hash, lines))
+        first = _common_prefix(self.hashes, hashes)
+        suffix = _common_suffix(self.hashes, hashes, min(len(self.hashes), len(hashes)) - first)
+        old_end = len(self.hashes) - suffix
+        new_end = len(hashes) - suffix
+        if first == old_end == new_end:
+            return first, first
+        return self._replace(first, old_end - first, lines[first:new_end], hashes[first:new_end])
+
+    def splice(self, first, count, lines):
+        """Replace count lines from first with lines, as an edit did; returns the lines re-scanned"""
+        return self._replace(first, count, lines, array("q", map(hash, lines)))
+
+    def _replace(self, first, count, lines, hashes):
+        old_end = first + count
+        new_end = first + len(lines)
+        infos = [line_info(line) for line in lines]
+        self.hashes[first:old_end] = hashes
+        self.indents[first:old_end] = array("i", [indent for indent, _ in infos])
+        self.deltas[first:old_end] = array("i", [delta for _, delta in infos])
+        self.depths[first:old_end] = array("i", bytes(4 * len(infos)))
+
+        # Depths change from the edit on, until they line up with the old ones again
+        depth = max(self.depths[first - 1] + self.deltas[first - 1], 0) if first else 0
+        line = first
+        while line < len(self.hashes):
+            if line >= new_end and self.depths[line] == depth:
+                break
+            self.depths[line] = depth
+            depth = max(depth + self.deltas[line], 0)
+            line += 1
+        self._update_regions(first, line, len(lines) - count)
+        return first, line
+
+    def _is_anchor(self, line):
+        """A top-level line outside brackets: no region runs across it"""
+        return self.indents[line] == 0 and self.depths[line] == 0
+
+    def _update_regions(self, first, end, delta):
+        """Re-scan the regions from the anchor before first to the anchor after end; shift the rest"""
+        # Both anchors must be lines the edit left alone, so they hold in the old regions too
+        start = min(first - 1, len(self.indents) - 1)
+        while start > 0 and not self._is_anchor(start):
+            start -= 1
+        stop = end
+        while stop < len(self.indents) and not self._is_anchor(stop):
+            stop += 1
+        old = self._regions
+        start = max(start, 0)
+        before = old[:bisect.bisect_left(old, (start, -1))]
+        # Lines from stop on are unchanged, only moved by delta
+        after = [(header + delta, last + delta) for header, last in old[bisect.bisect_left(old, (stop - delta, -1)):]]
+        self._regions = before + self._scan(start, stop) + after
+
+    def _scan(self, start, stop):
+        """Regions with headers in start..stop-1, for lines start and stop that are anchors or the ends"""
+        ends = {}
+        indents, deltas, depths = self.indents, self.deltas, self.depths
+
+        # Indentation: a line folds the non-blank lines indented deeper below it
+        stack = []
+        previous = -1
+        for line in range(start, stop):
+            indent = indents[line]
+            if indent < 0:
+                continue
+            if depths[line] == 0:
+                while stack and stack[-1][0] >= indent:
+                    header = stack.pop()[1]
+                    if previous > header:
+                        ends[header] = previous
+                stack.append((indent, line))
+            previous = line
+        for _, header in stack:
+            if previous > header:
+                ends[header] = previous
+
+        # Brackets: a line leaving brackets open folds up to the line closing them
+        stack = []
+        for line in range(start, stop):
+            begin = depths[line]
+            end = max(begin + deltas[line], 0)
+            while stack and end <= stack[-1][0]:
+                header = stack.pop()[1]
+                if line - 1 > header:
+                    # The closing line stays visible
+                    ends[header] = line - 1
+            if end > begin:
+                stack.append((begin, line))
+
+        return sorted(ends.items())
+
+    def regions(self):
+        """Fold regions as (header, last) 0-based line pairs, sorted by header"""
+        return self._regions
+
+    def region_at(self, line):
+        """Innermost region whose header is line or that contains it, or None"""
+        regions = self._regions
+        # The innermost containing region has the largest header at or above line
+        for position in range(bisect.bisect_right(regions, (line, len(self.indents))) - 1, -1, -1):
+            header, last = regions[position]
+            if last >= line or header == line:
+                return header, last
+        return None
@@ -0,0 +1,44 @@
+"""
+Simply Note It - Fuzzy matching
+Scores a query as a case-insensitive subsequence of a candidate
+"""
+
+import heapq
+
+# Characters after which a match counts as the start of a word
+WORD_BREAKS = "_-./\\ :"
+
+
+def score(query, candidate):
+    """Score how well query matches candidate, or None if it does not"""
+    if not query:
+        return 0
+    lowered = candidate.lower()
+    position = -1
+    previous = -2
+    total = 0
+    for char in query.lower():
+        position = lowered.find(char, position + 1)
+        if position == -1:
+            return None
+        if position == previous + 1:
+            total += 5  # Consecutive run
+        if position == 0 or candidate[position - 1] in WORD_BREAKS:
+            total += 8  # Start of a word
+        elif candidate[position].isupper() and candidate[position - 1].islower():
+            total += 6  # camelCase hump
+        previous = position
+    # Prefer short candidates and matches that end early
+    return total - len(candidate) * 0.1 - previous * 0.05
+
+
+def rank(query, candidates, limit=50, key=None):
+    """Best matching candidates, best first"""
+    scored = []
+    for candidate in candidates:
+        text = key(candidate) if key else candidate
+        value = score(query, text)
+        if value is not None:
+            scored.append((value, text, candidate))
+    best = heapq.nlargest(limit, scored, key=lambda entry: (entry[0], -len(entry[1])))
+    return [candidate for _, _, candidate in best]
@@ -0,0 +1,193 @@
+"""
+Simply Note It - Hex view
+Binary files are memory-mapped and rendered a page of rows at a time, so
+their size does not matter. Overwrites are kept aside until saved, then
+written into a writable map of the file and flushed.
+"""
+
+import mmap
+import os
+
+ROW_BYTES = 16
+
+# Bytes read to decide whether a file looks binary
+SNIFF_BYTES = 8192
+
+# Searching covers this much of the map per step, and one step of a search may hold the UI this long
+SEARCH_WINDOW = 16 * 1024 * 1024
+SEARCH_SLICE = 0.03
+
+# Printable ASCII shows as itself, everything else as a dot
+_ASCII = bytes(byte if 0x20 <= byte < 0x7f else ord(".") for byte in range(256))
+
+# Row layout: offset, two spaces, 16 hex cells with an extra space after the 8th, two spaces, |ascii|
+_HEX_WIDTH = ROW_BYTES * 3
+
+
+def looks_binary(path):
+    """Whether the start of a file holds a NUL byte, which text files never do"""
+    try:
+        with open(path, "rb") as file:
+            return b"\0" in file.read(SNIFF_BYTES)
+    except OSError:
+        return False
+
+
+def parse_offset(text, current=0):
+    """Offset from text: decimal, 0x hex, or +/- either for relative to current"""
+    text = text.strip().replace("_", "")
+    if text[:1] in ("+", "-"):
+        return current + int(text, 0)
+    return int(text, 0)
+
+
+def parse_needle(text):
+    """Bytes to search for: hex pairs like "de ad be ef", or quoted text"""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1].encode("utf-8")
+    try:
+        return bytes.fromhex(text)
+    except ValueError:
+        return text.encode("utf-8")
+
+
+class HexDocument:
+    """A read-only map of a file plus the bytes overwritten since the last save"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.size = os.fstat(self.file.fileno()).st_size
+        # Empty files cannot be mapped
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.pending = {}  # row -> {offset: byte value}, until saved; rows keep read() to the window
+        self.history = []  # (offset, pending value it replaced or None), for undo
+        self.offset_width = max(8, len(f"{max(self.size - 1, 0):x}"))
+
+    @property
+    def rows(self):
+        return (self.size + ROW_BYTES - 1) // ROW_BYTES
+
+    def edited(self, offset, length):
+        """(offset, value) of the pending overwrites within a range"""
+        for row in range(offset // ROW_BYTES, (offset + length + ROW_BYTES - 1) // ROW_BYTES):
+            for position, value in self.pending.get(row, {}).items():
+                if offset <= position < offset + length:
+                    yield position, value
+
+    def pending_value(self, offset):
+        return self.pending.get(offset // ROW_BYTES, {}).get(offset)
+
+    def set_pending(self, offset, value):
+        """Keep value for offset until saved, or drop the overwrite if value is None"""
+        row = offset // ROW_BYTES
+        if value is not None:
+            self.pending.setdefault(row, {})[offset] = value
+        elif row in self.pending:
+            self.pending[row].pop(offset, None)
+            if not self.pending[row]:
+                del self.pending[row]
+
+    def read(self, offset, length):
+        """Bytes as they will be once saved"""
+        data = bytearray(self.map[offset:offset + length]) if self.map else bytearray()
+        for position, value in self.edited(offset, len(data)):
+            data[position - offset] = value
+        return data
+
+    def render(self, first_row, count):
+        """Text for count rows starting at first_row"""
+        lines = []
+        for row in range(first_row, min(first_row + count, self.rows)):
+            offset = row * ROW_BYTES
+            lines.append(self.row_text(offset, self.read(offset, ROW_BYTES)))
+        return "\n".join(lines)
+
+    def row_text(self, offset, data):
+        hex_cells = data.hex(" ")
+        if len(data) > ROW_BYTES // 2:
+            split = ROW_BYTES // 2 * 3
+            hex_cells = hex_cells[:split] + " " + hex_cells[split:]
+        ascii_cells = bytes(data).translate(_ASCII).decode("ascii")
+        return f"{offset:0{self.offset_width}x}  {hex_cells:<{_HEX_WIDTH}}  |{ascii_cells}|"
+
+    def column(self, index, side):
+        """Column of byte index within a row, in the hex or the ascii cells"""
+        hex_start = self.offset_width + 2
+        if side == "hex":
+            return hex_start + index * 3 + (1 if index >= ROW_BYTES // 2 else 0)
+        return hex_start + _HEX_WIDTH + 3 + index
+
+    def locate(self, column):
+        """(byte index within the row, side) for a column, or None off the cells"""
+        hex_start = self.offset_width + 2
+        ascii_start = hex_start + _HEX_WIDTH + 3
+        if hex_start <= column < hex_start + _HEX_WIDTH:
+            relative = column - hex_start
+            if relative > ROW_BYTES // 2 * 3:
+                relative -= 1
+            return min(relative // 3, ROW_BYTES - 1), "hex"
+        if ascii_start <= column < ascii_start + ROW_BYTES:
+            return column - ascii_start, "ascii"
+        return None
+
+    def overwrite(self, offset, value):
+        if not 0 <= offset < self.size:
+            raise IndexError("offset outside the file")
+        self.history.append((offset, self.pending_value(offset)))
+        self.set_pending(offset, None if self.map[offset] == value else value)
+
+    def undo(self):
+        """Take back the last overwrite; returns its offset, or None if there is none"""
+        if not self.history:
+            return None
+        offset, value = self.history.pop()
+        self.set_pending(offset, value)
+        return offset
+
+    def save(self):
+        """Write the overwritten bytes into the file in place"""
+        if not self.pending:
+            return 0
+        with open(self.path, "r+b") as file:
+            # Something else may have truncated the file since it was opened
+            size = os.fstat(file.fileno()).st_size
+            last = max(max(offsets) for offsets in self.pending.values())
+            if last >= size:
+                raise ValueError(f"the file is now {size} bytes, too short for the byte at 0x{last:x}")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE) as writable:
+                for offsets in self.pending.values():
+                    for offset, value in offsets.items():
+                        writable[offset] = value
+                writable.flush()
+        # Both maps share the page cache, so the read map already sees the new bytes
+        saved = sum(len(offsets) for offsets in self.pending.values())
+        self.pending.clear()
+        self.history.clear()
+        return saved
+
+    def search(self, needle, start):
+        """Generator finding needle from start on, wrapping around once. Yields None after
+        each window of the map, then the offset found or -1. Saved bytes only."""
+        if not self.map or not needle:
+            yield -1
+            return
+        start = min(max(start, 0), self.size)
+        for low, high in ((start, self.size), (0, min(start + len(needle) - 1, self.size))):
+            position = low
+            while position < high:
+                # Windows overlap by len(needle) - 1 so no match straddles two unseen
+                end = min(position + SEARCH_WINDOW + len(needle) - 1, high)
+                found = self.map.find(needle, position, end)
+                if found != -1:
+                    yield found
+                    return
+                position += SEARCH_WINDOW
+                yield None
+        yield -1
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
@@ -0,0 +1,126 @@
+"""
+Simply Note It - Single instance
+The first editor listens on a Unix domain socket; later launches hand it
+their files and exit without starting Tk
+"""
+
+import json
+import os
+import socket
+import stat
+import tempfile
+import threading
+
+SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+# Largest request we accept, and how long a launch waits for the running editor
+MAX_MESSAGE = 1024 * 1024
+TIMEOUT = 1.0
+
+
+def socket_dir():
+    """
+    Directory for the socket, created if needed. Only we may use it, so no
+    other user can take the socket name or put their own socket in its place;
+    raises PermissionError for one that someone else owns or can get into.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        directory = os.path.join(runtime, "simply-note-it")
+    else:
+        directory = os.path.join(tempfile.gettempdir(), f"simply-note-it-{os.getuid()}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o700:
+        raise PermissionError(f"Refusing socket directory {directory}: it must be a directory of ours with mode 0700")
+    return directory
+
+
+def socket_path():
+    """Per-user socket location, in a directory only we can use"""
+    return os.path.join(socket_dir(), "instance.sock")
+
+
+def forward(paths, path=None):
+    """Send paths to a running editor; returns True if it took them"""
+    if not SUPPORTED:
+        return False
+    message = json.dumps([os.path.abspath(p) for p in paths]).encode("utf-8") + b"\n"
+    try:
+        path = path or socket_path()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(TIMEOUT)
+            client.connect(path)
+            client.sendall(message)
+            return client.recv(16).startswith(b"ok")
+    except OSError:
+        return False
+
+
+class InstanceServer:
+    """Accepts file lists from later launches and passes them to on_paths"""
+
+    def __init__(self, on_paths, path=None):
+        self.on_paths = on_paths  # Called from the listener thread
+        self.path = path
+        self.server = None
+
+    def start(self):
+        """Start listening; returns False if another editor already is"""
+        if not SUPPORTED:
+            return False
+        if self.path is None:
+            try:
+                self.path = socket_path()
+            except OSError:
+                return False  # No safe place for it; run as a lone editor
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.path)
+        except OSError:
+            # A live editor owns the socket, or a crashed one left it behind
+            if forward([], self.path):
+                server.close()
+                return False
+            try:
+                os.unlink(self.path)
+                server.bind(self.path)
+            except OSError:
+                server.close()
+                return False
+        os.chmod(self.path, 0o600)
+        server.listen(8)
+        self.server = server
+        threading.Thread(target=self._serve, args=(server,), daemon=True).start()
+        return True
+
+    def _serve(self, server):
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return  # Closed by stop()
+            with connection:
+                try:
+                    connection.settimeout(TIMEOUT)
+                    data = b""
+                    while not data.endswith(b"\n") and len(data) < MAX_MESSAGE:
+                        chunk = connection.recv(65536)
+                        if not chunk:
+                            break
+                        data += chunk
+                    paths = json.loads(data.decode("utf-8"))
+                    self.on_paths([str(p) for p in paths])
+                    connection.sendall(b"ok\n")
+                except (OSError, ValueError):
+                    pass
+
+    def stop(self):
+        """Stop listening and remove the socket"""
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,71 @@
+"""
+Simply Note It - Long-line protection
+Detects pathological line lengths while loading and elides them for display
+"""
+
+import re
+
+# Lines longer than this make Tk's line layout crawl
+LONG_LINE_LIMIT = 5000
+
+# How much of a long line is shown up front, and how much each expand adds
+DISPLAY_HEAD = 2000
+EXPAND_STEP = 50000
+
+CHUNK_SIZE = 1024 * 1024
+
+# Longer than the limit, the same test elide_long_lines cuts on
+_long_line = re.compile("[^\n]{%d}" % (LONG_LINE_LIMIT + 1))
+
+
+def read_text(file, chunk_size=CHUNK_SIZE):
+    """Read an open text file in chunks, returning (content, has_long_lines)"""
+    chunks = []
+    has_long_lines = False
+    current = 0  # Length of the line running off the end of the last chunk
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if has_long_lines:
+            continue
+        first = chunk.find("\n")
+        if first == -1:
+            current += len(chunk)
+        else:
+            current += first
+            if current > LONG_LINE_LIMIT or _long_line.search(chunk, first):
+                has_long_lines = True
+            current = len(chunk) - chunk.rfind("\n") - 1
+        if current > LONG_LINE_LIMIT:
+            has_long_lines = True
+    return "".join(chunks), has_long_lines
+
+
+def elide_long_lines(text, limit=LONG_LINE_LIMIT, head=DISPLAY_HEAD):
+    """
+    Cut long lines down for display.
+
+    Returns (display_text, elisions) where each elision is
+    (line_number, column, remainder): the hidden rest of that line starts at
+    line_number.column in the display text.
+    """
+    elisions = []
+    lines = text.split("\n")
+    for number, line in enumerate(lines, 1):
+        if len(line) > limit:
+            elisions.append((number, head, line[head:]))
+            lines[number - 1] = line[:head]
+    return "\n".join(lines), elisions
+
+
+def format_size(chars):
+    """Human readable size of a hidden remainder"""
+    for unit in ("chars", "K", "M"):
+        if chars < 1024 or unit == "M":
+            break
+        chars /= 1024
+    if unit == "chars":
+        return f"{chars} chars"
+    return f"{chars:.1f}{unit} chars"
@@ -4,26 +4,146 @@ Simply Note It - A simple text editor with split panels
 Simplified version with better panel management
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+import bisect
 import os
 import sys
 
+if __name__ == "__main__" and "--batch" in sys.argv[1:]:
+    # Batch mode shares the editing engines but never loads tkinter
+    import batch
+    sys.exit(batch.main([arg for arg in sys.argv[1:] if arg != "--batch"]))
+
+if __name__ == "__main__" and "--new-instance" not in sys.argv[1:]:
+    # Hand our files to an editor that is already running
+    import instance
+    if instance.forward([arg for arg in sys.argv[1:] if not arg.startswith("--")]):
+        sys.exit(0)
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog, font
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import clipboard
+import diagnostics
+import export
+import fileio
+import folding
+import fuzzy
+import hexview
+import instance
+import longlines
+import memory
+import multicursor
+import outline
+import overview
+import plugins
+import quickopen
+import themes
+import transforms
+
 class SimplyNoteIt:
     def __init__(self, root):
         self.root = root
         self.root.title("Simply Note It")
         self.root.geometry("1200x800")
         
-        # Current file
+        # Current file; other panels keep theirs in panel_files as (file, changed)
         self.current_file = None
         self.text_changed = False
+        self.panel_files = {}
         
         # Split panel support
         self.split_mode = False
         self.panels = []
         self.current_panel = 0
         
+        # Hidden remainders of elided long lines, per panel
+        self.elisions = {}
+        
+        # Extra cursors, per panel
+        self.multicursors = {}
+        self.multicursor_needle = {}
+        self.column_anchor = "1.0"
+        
+        # Pending return of the status bar to "Ready"
+        self.status_reset_job = None
+        
+        # Plugins are only listed here; headers are read after startup
+        self.plugin_manager = plugins.PluginManager()
+        self.buffer_change_job = None
+        
+        # Slow mounts (WSL /mnt/c) get read-ahead and write-behind saves
+        self.stat_cache = fileio.StatCache()
+        self.write_behind = fileio.WriteBehind(stat_cache=self.stat_cache)
+        self.flush_watch = None
+        
+        # Compressed files being streamed in: {panel: state dict}
+        self.streams = {}
+        
+        # Quick open file indexes, per project root
+        self.file_indexes = {}
+        self.indexing = set()
+        
+        # Fold structure per panel, updated from the lines that changed
+        self.fold_indexes = {}
+        # {panel: whether its fold_first/fold_last marks bound edits}; missing means a full diff is due
+        self.fold_edits = {}
+        
+        # Memory accounting; idle, unmodified panels are unloaded to compressed form
+        self.show_memory = tk.BooleanVar(value=False)
+        self.undo_chars = {}
+        self.focus_times = {}
+        self.unloaded = {}
+        self.unloading = set()
+        self.memory_label_job = None
+        
+        # Worker processes for parsing, started on first use
+        self.process_pool = None
+        
+        # Python outline side pane
+        self.show_outline = tk.BooleanVar(value=False)
+        self.outline_symbols = {}
+        self.outline_items = {}
+        self.shown_symbols = None
+        self.outline_job = None
+        self.outline_generation = 0
+        
+        # Python diagnostics per panel as (line starts, diagnostics); edit counts drop stale results
+        self.diagnostics = {}
+        self.diagnostic_jobs = {}
+        self.diagnostic_tag_jobs = {}
+        self.edit_generations = {}
+        
+        # Memory-mapped hex view: {panel: state dict}; the panel holds only the rows in view
+        self.hex_views = {}
+        self.hex_overwrite = tk.BooleanVar(value=False)
+        self.hex_needle = ""
+        
+        # Overview ruler beside each panel: {panel: state dict}
+        self.show_overview = tk.BooleanVar(value=False)
+        self.overviews = {}
+        
+        # Large clipboard transfers; lazy copies need X11 selection handlers
+        self.lazy_clipboard = clipboard.LazyClipboard()
+        self.x11 = self.root.tk.call("tk", "windowingsystem") == "x11"
+        if self.x11:
+            self.root.selection_handle(self.lazy_clipboard.serve, selection="CLIPBOARD")
+        self.pasting = set()
+        
+        # Later launches forward their files to this editor
+        self.instance_requests = queue.Queue()
+        self.instance_requests_raise = False
+        self.instance_server = instance.InstanceServer(self.instance_request)
+        
+        # Theme and font shared by every panel
+        self.editor_font = font.Font(family=themes.FONT_FAMILY, size=12)
+        self.theme_name = tk.StringVar(value=themes.DEFAULT_THEME)
+        self.theme_options, self.theme_tags = themes.compile_theme(themes.DEFAULT_THEME)
+        
         # Create menu bar
         self.create_menu()
         
@@ -41,6 +161,14 @@ class SimplyNoteIt:
         
         # Set initial focus
         self.text_area.focus_set()
+        
+        # Read plugin headers once the window is up
+        self.root.after_idle(self.load_plugins)
+        
+        # Finish flushing saves an earlier session left staged
+        self.root.after_idle(self.recover_staged_saves)
+        
+        self.root.after(memory.CHECK_INTERVAL_MS, self.check_memory)
     
     def create_menu(self):
         """Create the menu bar"""
@@ -52,8 +180,12 @@ class SimplyNoteIt:
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="New", command=self.new_file, accelerator="Ctrl+N")
         file_menu.add_command(label="Open", command=self.open_file, accelerator="Ctrl+O")
+        file_menu.add_command(label="Quick Open...", command=self.quick_open, accelerator="Ctrl+P")
+        file_menu.add_command(label="Open in Hex View...", command=self.open_hex_file)
         file_menu.add_command(label="Save", command=self.save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As", command=self.save_as_file, accelerator="Ctrl+Shift+S")
+        file_menu.add_command(label="Load More", command=self.load_more)
+        file_menu.add_command(label="Export...", command=self.export_file)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_app, accelerator="Ctrl+Q")
         
@@ -69,6 +201,12 @@ class SimplyNoteIt:
         edit_menu.add_separator()
         edit_menu.add_command(label="Select All", command=self.select_all, accelerator="Ctrl+A")
         edit_menu.add_command(label="Find", command=self.find_text, accelerator="Ctrl+F")
+        edit_menu.add_command(label="Go to Offset...", command=self.hex_goto, accelerator="Ctrl+G")
+        edit_menu.add_checkbutton(label="Hex Overwrite Mode", variable=self.hex_overwrite, accelerator="Insert")
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Add Cursor at Next Match", command=self.add_cursor_at_next_match, accelerator="Ctrl+D")
+        edit_menu.add_command(label="Cursor per Line", command=self.cursor_per_line, accelerator="Ctrl+Shift+L")
+        edit_menu.add_command(label="Clear Cursors", command=lambda: self.clear_multicursor(self.get_current_panel()), accelerator="Esc")
         
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
@@ -79,6 +217,37 @@ class SimplyNoteIt:
         view_menu.add_separator()
         view_menu.add_command(label="Next Panel", command=self.next_panel, accelerator="Ctrl+Tab")
         view_menu.add_command(label="Previous Panel", command=self.prev_panel, accelerator="Ctrl+Shift+Tab")
+        view_menu.add_separator()
+        view_menu.add_checkbutton(label="Outline", variable=self.show_outline, command=self.toggle_outline, accelerator="Ctrl+Shift+O")
+        view_menu.add_command(label="Go to Symbol...", command=self.goto_symbol, accelerator="Ctrl+R")
+        view_menu.add_checkbutton(label="Overview Ruler", variable=self.show_overview, command=self.toggle_overview)
+        view_menu.add_separator()
+        view_menu.add_command(label="Toggle Fold", command=self.toggle_fold, accelerator="Ctrl+Shift+F")
+        view_menu.add_command(label="Fold All", command=self.fold_all)
+        view_menu.add_command(label="Unfold All", command=self.unfold_all)
+        view_menu.add_separator()
+        view_menu.add_command(label="Memory Usage...", command=self.show_memory_usage)
+        view_menu.add_checkbutton(label="Memory in Status Bar", variable=self.show_memory, command=self.update_memory_label)
+        view_menu.add_separator()
+        theme_menu = tk.Menu(view_menu, tearoff=0)
+        view_menu.add_cascade(label="Theme", menu=theme_menu)
+        for name in themes.THEMES:
+            theme_menu.add_radiobutton(label=name, variable=self.theme_name, value=name, command=self.change_theme)
+        
+        # Transform menu
+        transform_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Transform", menu=transform_menu)
+        transform_menu.add_command(label="Sort Lines", command=lambda: self.run_transform("sort"))
+        transform_menu.add_command(label="Unique Lines", command=lambda: self.run_transform("unique"))
+        transform_menu.add_command(label="Trim Trailing Whitespace", command=lambda: self.run_transform("trim"))
+        transform_menu.add_separator()
+        transform_menu.add_command(label="Reindent", command=lambda: self.run_transform("reindent"))
+        transform_menu.add_command(label="Tabs to Spaces", command=lambda: self.run_transform("tabs-to-spaces"))
+        transform_menu.add_command(label="Spaces to Tabs", command=lambda: self.run_transform("spaces-to-tabs"))
+        
+        # Plugins menu, filled in when opened
+        self.plugin_menu = tk.Menu(menubar, tearoff=0, postcommand=self.build_plugin_menu)
+        menubar.add_cascade(label="Plugins", menu=self.plugin_menu)
     
     def create_toolbar(self):
         """Create the toolbar"""
@@ -108,7 +277,7 @@ class SimplyNoteIt:
         # Font size
         ttk.Label(toolbar, text="Font Size:").pack(side=tk.LEFT, padx=2)
         self.font_size = tk.StringVar(value="12")
-        font_combo = ttk.Combobox(toolbar, textvariable=self.font_size, width=5, values=["8", "9", "10", "11", "12", "14", "16", "18", "20", "24"])
+        font_combo = ttk.Combobox(toolbar, textvariable=self.font_size, width=5, values=themes.FONT_SIZES)
         font_combo.pack(side=tk.LEFT, padx=2)
         font_combo.bind("<<ComboboxSelected>>", self.change_font_size)
     
@@ -118,70 +287,179 @@ class SimplyNoteIt:
         self.text_frame = ttk.Frame(self.root)
         self.text_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # Outline pane, shown on demand to the right of the panels
+        self.outline_frame = ttk.Frame(self.root)
+        self.outline_tree = ttk.Treeview(self.outline_frame, show="tree", selectmode="browse")
+        outline_scroll = ttk.Scrollbar(self.outline_frame, orient=tk.VERTICAL, command=self.outline_tree.yview)
+        self.outline_tree.config(yscrollcommand=outline_scroll.set)
+        outline_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.outline_tree.pack(fill=tk.BOTH, expand=True)
+        self.outline_tree.bind("<<TreeviewSelect>>", self.on_outline_select)
+        
         # Create main text widget with scrollbar
-        self.text_area = scrolledtext.ScrolledText(
+        self.text_area = self.create_panel()
+        self.text_area.pack(fill=tk.BOTH, expand=True)
+        
+        # Add to panels list
+        self.panels = [self.text_area]
+    
+    def create_panel(self):
+        """Create a text panel styled with the current theme"""
+        panel = scrolledtext.ScrolledText(
             self.text_frame,
             wrap=tk.WORD,
-            font=("Consolas", 12),
+            font=self.editor_font,
             undo=True,
-            maxundo=50
+            maxundo=50,
+            **self.theme_options
         )
-        self.text_area.pack(fill=tk.BOTH, expand=True)
+        for tag, options in self.theme_tags.items():
+            panel.tag_configure(tag, **options)
+        # Folded lines are elided, so Tk neither lays them out nor draws them
+        panel.tag_configure("fold", elide=True)
         
-        # Configure text widget
-        self.text_area.config(
-            tabs=("2c", "4c", "6c", "8c"),  # Tab stops
-            insertbackground="black",
-            selectbackground="lightblue"
-        )
+        # Editor shortcuts run between the panel's own bindings and the Text class
+        tags = panel.bindtags()
+        panel.bindtags((tags[0], "EditorKeys") + tags[1:])
         
-        # Add to panels list
-        self.panels = [self.text_area]
+        # Text change detection
+        panel.bind("<KeyPress>", self.on_text_change)
+        panel.bind("<Button-1>", self.on_text_change)
+        
+        # Multi-cursor; these override Text class bindings for the same keys
+        panel.bind("<Control-d>", lambda e: self.add_cursor_at_next_match() or "break")
+        panel.bind("<Control-L>", lambda e: self.cursor_per_line() or "break")
+        panel.bind("<Alt-Button-1>", self.column_select_start)
+        panel.bind("<Alt-B1-Motion>", self.column_select_drag)
+        
+        # Clipboard; these replace the Text class bindings so large transfers stay responsive
+        panel.bind("<<Cut>>", lambda e: self.on_copy(panel, cut=True))
+        panel.bind("<<Copy>>", lambda e: self.on_copy(panel))
+        panel.bind("<<Paste>>", lambda e: self.on_paste(panel))
+        
+        # Diagnostic messages show in the status bar on hover
+        for tag in ("diagnostic_error", "diagnostic_warning"):
+            panel.tag_bind(tag, "<Enter>", lambda e: self.show_diagnostic(panel, e))
+        
+        # The hex view scrolls by file rows and re-renders when resized
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            panel.bind(sequence, lambda e: self.hex_wheel(panel, e))
+        panel.bind("<Configure>", lambda e: self.render_hex(panel))
+        
+        # Undo and redo edit away from the cursor, so folding has to diff afterwards
+        panel.bind("<<Undo>>", lambda e: self.forget_fold_edits(panel))
+        panel.bind("<<Redo>>", lambda e: self.forget_fold_edits(panel))
+        
+        # Unloaded panels come back when focused
+        panel.bind("<FocusIn>", lambda e: self.on_panel_focus(panel))
+        self.focus_times[panel] = time.monotonic()
+        
+        # Scrolling also moves the overview viewport
+        panel.config(yscrollcommand=lambda first, last: self.on_panel_scroll(panel, first, last))
+        if self.show_overview.get():
+            self.attach_overview(panel)
+        return panel
     
     def create_status_bar(self):
         """Create the status bar"""
         self.status_bar = ttk.Label(self.root, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.memory_label = ttk.Label(self.status_bar, anchor=tk.E)
     
     def bind_events(self):
         """Bind keyboard shortcuts and events"""
         # Keyboard shortcuts
-        self.root.bind("<Control-n>", lambda e: self.new_file())
-        self.root.bind("<Control-o>", lambda e: self.open_file())
-        self.root.bind("<Control-s>", lambda e: self.save_file())
-        self.root.bind("<Control-Shift-S>", lambda e: self.save_as_file())
-        self.root.bind("<Control-q>", lambda e: self.exit_app())
-        self.root.bind("<Control-z>", lambda e: self.undo())
-        self.root.bind("<Control-y>", lambda e: self.redo())
-        self.root.bind("<Control-x>", lambda e: self.cut())
-        self.root.bind("<Control-c>", lambda e: self.copy())
-        self.root.bind("<Control-v>", lambda e: self.paste())
-        self.root.bind("<Control-a>", lambda e: self.select_all())
-        self.root.bind("<Control-f>", lambda e: self.find_text())
-        self.root.bind("<Control-Shift-H>", lambda e: self.split_horizontal())
-        self.root.bind("<Control-Shift-V>", lambda e: self.split_vertical())
-        self.root.bind("<Control-Shift-W>", lambda e: self.close_split())
-        self.root.bind("<Control-Tab>", lambda e: self.next_panel())
-        self.root.bind("<Control-Shift-Tab>", lambda e: self.prev_panel())
-        
-        # Text change detection
-        self.text_area.bind("<KeyPress>", self.on_text_change)
-        self.text_area.bind("<Button-1>", self.on_text_change)
+        shortcuts = {
+            "<Control-n>": self.new_file,
+            "<Control-o>": self.open_file,
+            "<Control-p>": self.quick_open,
+            "<Control-s>": self.save_file,
+            "<Control-Shift-S>": self.save_as_file,
+            "<Control-q>": self.exit_app,
+            "<Control-z>": self.undo,
+            "<Control-y>": self.redo,
+            "<Control-x>": self.cut,
+            "<Control-c>": self.copy,
+            "<Control-v>": self.paste,
+            "<Control-a>": self.select_all,
+            "<Control-f>": self.find_text,
+            "<Control-Shift-H>": self.split_horizontal,
+            "<Control-Shift-V>": self.split_vertical,
+            "<Control-Shift-W>": self.close_split,
+            "<Control-Tab>": self.next_panel,
+            "<Control-Shift-Tab>": self.prev_panel,
+            "<Control-Shift-O>": lambda: self.show_outline.set(not self.show_outline.get()) or self.toggle_outline(),
+            "<Control-r>": self.goto_symbol,
+            "<Control-Shift-F>": self.toggle_fold,
+            "<Control-g>": self.hex_goto,
+        }
+        for sequence, command in shortcuts.items():
+            self.root.bind(sequence, lambda e, command=command: command())
+            
+            # Panels run them before the Text class, which has its own meaning for many
+            # (Ctrl+O opens a line, Ctrl+Z undoes), and stop there so nothing runs twice
+            def run_in_panel(event, command=command):
+                command()
+                return "break"
+            self.root.bind_class("EditorKeys", sequence, run_in_panel)
         
         # Window close
         self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
     
     def on_text_change(self, event=None):
         """Handle text changes"""
+        if event is not None and (event.widget in self.streams or event.widget in self.pasting):
+            return  # Read-only until the load or paste is done
+        if event is not None and event.widget in self.unloaded:
+            self.restore_panel(event.widget)
+            return
+        if event is not None and event.widget in self.hex_views:
+            if event.type == tk.EventType.ButtonPress:
+                return self.hex_click(event.widget, event)
+            return self.hex_key(event.widget, event)
+        if event is not None and event.widget in self.multicursors:
+            if event.type == tk.EventType.ButtonPress:
+                self.clear_multicursor(event.widget)
+            elif self.multicursor_key(event.widget, event):
+                return "break"
+        
         self.text_changed = True
         self.update_title()
-        return "break"  # Don't interfere with the event
+        
+        # Debounced so plugins never run per keystroke
+        if self.plugin_manager.has_subscribers("on_buffer_change") and \
+                (event is None or event.type == tk.EventType.KeyPress):
+            if self.buffer_change_job:
+                self.root.after_cancel(self.buffer_change_job)
+            self.buffer_change_job = self.root.after(300, self.buffer_changed)
+        
+        if self.show_outline.get():
+            self.schedule_outline()
+        
+        panel = event.widget if event is not None else self.get_current_panel()
+        if event is None:
+            self.forget_fold_edits(panel)
+        elif event.type == tk.EventType.KeyPress:
+            self.note_undo(panel, 1)
+            self.note_fold_edit(panel)
+        if (event is None or event.type == tk.EventType.KeyPress) and self.is_python_panel(panel):
+            self.schedule_diagnostics(panel)
+        
+        if panel in self.overviews:
+            if event is not None and event.type == tk.EventType.ButtonPress:
+                # Catch up before the click moves the cursor away from the edit
+                if self.overviews[panel]["job"]:
+                    self.update_overview(panel)
+            else:
+                self.schedule_overview(panel)
     
     def update_title(self):
         """Update window title with file status"""
         if self.current_file:
             filename = os.path.basename(self.current_file)
             status = "*" if self.text_changed else ""
+            if self.write_behind.is_flushing(self.current_file):
+                status += " (flushing)"
             panel_info = f" (Panel {self.current_panel + 1}/{len(self.panels)})" if len(self.panels) > 1 else ""
             self.root.title(f"{filename}{status} - Simply Note It{panel_info}")
         else:
@@ -191,8 +469,36 @@ class SimplyNoteIt:
     
     def update_status(self, message):
         """Update status bar"""
+        self.set_status(message)
+        self.status_reset_job = self.root.after(3000, lambda: self.set_status("Ready"))
+    
+    def set_status(self, message):
+        """Show message until something replaces it, cancelling a pending return to Ready"""
+        if self.status_reset_job:
+            self.root.after_cancel(self.status_reset_job)
+            self.status_reset_job = None
         self.status_bar.config(text=message)
-        self.root.after(3000, lambda: self.status_bar.config(text="Ready"))
+    
+    def run_in_background(self, work, on_done):
+        """Run work() in a worker thread and hand its result to on_done on the UI thread"""
+        results = queue.Queue()
+        
+        def worker():
+            try:
+                results.put((work(), None))
+            except Exception as e:
+                results.put((None, e))
+        
+        def poll():
+            try:
+                result, error = results.get_nowait()
+            except queue.Empty:
+                self.root.after(50, poll)
+                return
+            on_done(result, error)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, poll)
     
     def get_current_panel(self):
         """Get the currently active panel"""
@@ -200,25 +506,40 @@ class SimplyNoteIt:
             return self.panels[self.current_panel]
         return self.text_area
     
+    def set_current_panel(self, panel_index):
+        """Make another panel current, swapping in its file and unsaved flag"""
+        if panel_index == self.current_panel:
+            return
+        if 0 <= self.current_panel < len(self.panels):
+            self.panel_files[self.get_current_panel()] = (self.current_file, self.text_changed)
+        self.current_panel = panel_index
+        self.current_file, self.text_changed = self.panel_files.pop(self.get_current_panel(), (None, False))
+    
+    def panel_changed(self, panel):
+        """Whether a panel has unsaved edits"""
+        if panel is self.get_current_panel():
+            return self.text_changed
+        return self.panel_files.get(panel, (None, False))[1]
+    
     def focus_panel(self, panel_index):
         """Focus a specific panel"""
         if 0 <= panel_index < len(self.panels):
-            self.current_panel = panel_index
+            self.set_current_panel(panel_index)
             self.panels[panel_index].focus_set()
             self.update_title()
+            self.schedule_outline(0)
+            self.schedule_diagnostics(self.panels[panel_index], 0)
     
     def next_panel(self):
         """Switch to next panel"""
         if len(self.panels) > 1:
-            self.current_panel = (self.current_panel + 1) % len(self.panels)
-            self.focus_panel(self.current_panel)
+            self.focus_panel((self.current_panel + 1) % len(self.panels))
             self.update_status(f"Switched to panel {self.current_panel + 1}")
     
     def prev_panel(self):
         """Switch to previous panel"""
         if len(self.panels) > 1:
-            self.current_panel = (self.current_panel - 1) % len(self.panels)
-            self.focus_panel(self.current_panel)
+            self.focus_panel((self.current_panel - 1) % len(self.panels))
             self.update_status(f"Switched to panel {self.current_panel + 1}")
     
     # File operations
@@ -230,7 +551,13 @@ class SimplyNoteIt:
         
         # Clear the current panel
         current_panel = self.get_current_panel()
+        self.stop_stream(current_panel)
+        self.forget_unloaded(current_panel)
+        self.close_hex(current_panel)
         current_panel.delete(1.0, tk.END)
+        self.unprotect_panel(current_panel)
+        current_panel.edit_modified(False)
+        self.undo_chars.pop(current_panel, None)
         
         self.current_file = None
         self.text_changed = False
@@ -248,35 +575,160 @@ class SimplyNoteIt:
             filetypes=[
                 ("Text files", "*.txt"),
                 ("Python files", "*.py"),
+                ("Compressed files", "*.gz *.bz2 *.xz"),
                 ("All files", "*.*")
             ]
         )
         
         if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                    current_panel = self.get_current_panel()
-                    current_panel.delete(1.0, tk.END)
+            self.load_file(file_path)
+    
+    def quick_open(self):
+        """Fuzzy find a file under the current project and open it"""
+        root = quickopen.project_root(self.current_file or os.getcwd())
+        index = self.file_indexes.setdefault(root, quickopen.FileIndex(root))
+        
+        open_window = tk.Toplevel(self.root)
+        open_window.title(f"Quick Open - {root}")
+        open_window.geometry("600x400")
+        open_window.transient(self.root)
+        
+        query_entry = ttk.Entry(open_window)
+        query_entry.pack(fill=tk.X, padx=5, pady=5)
+        results_list = tk.Listbox(open_window, font=self.editor_font)
+        results_list.pack(fill=tk.BOTH, expand=True, padx=5)
+        info_label = ttk.Label(open_window, anchor=tk.W)
+        info_label.pack(fill=tk.X, padx=5, pady=5)
+        query_entry.focus_set()
+        matches = []
+        
+        def update(event=None):
+            if not open_window.winfo_exists():
+                return
+            matches[:] = index.search(query_entry.get())
+            results_list.delete(0, tk.END)
+            for path in matches:
+                results_list.insert(tk.END, path)
+            if matches:
+                results_list.selection_set(0)
+            indexing = " (indexing...)" if root in self.indexing else ""
+            info_label.config(text=f"{len(index):,} files{indexing}")
+        
+        def choose(event=None):
+            selection = results_list.curselection()
+            if selection:
+                open_window.destroy()
+                if self.text_changed:
+                    if messagebox.askyesno("Unsaved Changes", "Save current file?"):
+                        self.save_file()
+                self.load_file(os.path.join(root, matches[selection[0]]))
+        
+        def move(step):
+            selection = results_list.curselection()
+            position = min(max((selection[0] if selection else 0) + step, 0), len(matches) - 1)
+            results_list.selection_clear(0, tk.END)
+            results_list.selection_set(position)
+            results_list.see(position)
+            return "break"
+        
+        query_entry.bind("<KeyRelease>", lambda e: e.keysym in ("Up", "Down", "Return") or update())
+        query_entry.bind("<Return>", choose)
+        query_entry.bind("<Down>", lambda e: move(1))
+        query_entry.bind("<Up>", lambda e: move(-1))
+        query_entry.bind("<Escape>", lambda e: open_window.destroy())
+        results_list.bind("<Double-Button-1>", choose)
+        
+        update()
+        self.refresh_file_index(root, update)
+    
+    def refresh_file_index(self, root, on_update):
+        """Load the cached index, then bring it up to date, both off the UI thread"""
+        if root in self.indexing:
+            return
+        index = self.file_indexes[root]
+        self.indexing.add(root)
+        
+        def refresh():
+            listed = index.refresh()
+            index.save()
+            return listed
+        
+        def refreshed(listed, error):
+            self.indexing.discard(root)
+            if error:
+                self.update_status(f"Could not index {root}: {error}")
+            on_update()
+        
+        def loaded(result, error):
+            # Searchable from the cache straight away; the refresh follows
+            on_update()
+            self.run_in_background(refresh, refreshed)
+        
+        if len(index):
+            self.run_in_background(refresh, refreshed)
+        else:
+            self.run_in_background(index.load, loaded)
+    
+    def load_file(self, file_path):
+        """Load a file into the current panel"""
+        self.stop_stream(self.get_current_panel())
+        self.forget_unloaded(self.get_current_panel())
+        self.close_hex(self.get_current_panel())
+        if fileio.compression(file_path):
+            self.stream_file(file_path)
+            return
+        if hexview.looks_binary(file_path) and \
+                messagebox.askyesno("Binary File", f"{os.path.basename(file_path)} looks binary. Open it in the hex view?"):
+            self.open_hex(file_path)
+            return
+        try:
+            with fileio.open_text(file_path, stat_cache=self.stat_cache) as file:
+                content, has_long_lines = longlines.read_text(file)
+                current_panel = self.get_current_panel()
+                current_panel.delete(1.0, tk.END)
+                self.unprotect_panel(current_panel)
+                if has_long_lines:
+                    self.protect_panel(current_panel, content)
+                else:
                     current_panel.insert(1.0, content)
-                    self.current_file = file_path
-                    self.text_changed = False
-                    self.update_title()
+                current_panel.edit_modified(False)
+                self.undo_chars.pop(current_panel, None)
+                self.current_file = file_path
+                self.text_changed = False
+                self.update_title()
+                if has_long_lines:
+                    self.update_status(f"Opened: {os.path.basename(file_path)} (long lines elided)")
+                else:
                     self.update_status(f"Opened: {os.path.basename(file_path)}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not open file: {e}")
+                self.schedule_outline(0)
+                self.schedule_diagnostics(current_panel, 0)
+                self.reload_overview(current_panel, content)
+                if self.plugin_manager.has_subscribers("on_open"):
+                    self.dispatch_hook("on_open", self.plugin_context(current_panel, content))
+        except UnicodeDecodeError:
+            if messagebox.askyesno("Not Text", f"{os.path.basename(file_path)} is not UTF-8 text. Open it in the hex view?"):
+                self.open_hex(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open file: {e}")
     
     def save_file(self):
         """Save current file"""
+        if self.get_current_panel() in self.hex_views:
+            self.save_hex(self.get_current_panel())
+            return
+        if not self.can_save():
+            return
         if self.current_file:
             try:
                 current_panel = self.get_current_panel()
-                content = current_panel.get(1.0, tk.END)
-                with open(self.current_file, 'w', encoding='utf-8') as file:
-                    file.write(content)
+                content = self.panel_text(current_panel)
+                flushed = self.write_file(self.current_file, content)
                 self.text_changed = False
+                current_panel.edit_modified(False)
+                self.overview_saved(current_panel)
                 self.update_title()
-                self.update_status(f"Saved: {os.path.basename(self.current_file)}")
+                self.update_status(f"Saved: {os.path.basename(self.current_file)}{'' if flushed else ' (flushing...)'}")
+                self.dispatch_hook("on_save", self.plugin_context(current_panel, content))
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file: {e}")
         else:
@@ -284,12 +736,15 @@ class SimplyNoteIt:
     
     def save_as_file(self):
         """Save file with new name"""
+        if not self.can_save():
+            return
         file_path = filedialog.asksaveasfilename(
             title="Save As",
             defaultextension=".txt",
             filetypes=[
                 ("Text files", "*.txt"),
                 ("Python files", "*.py"),
+                ("Compressed files", "*.gz *.bz2 *.xz"),
                 ("All files", "*.*")
             ]
         )
@@ -297,29 +752,1357 @@ class SimplyNoteIt:
         if file_path:
             try:
                 current_panel = self.get_current_panel()
-                content = current_panel.get(1.0, tk.END)
-                with open(file_path, 'w', encoding='utf-8') as file:
-                    file.write(content)
+                content = self.panel_text(current_panel)
+                flushed = self.write_file(file_path, content)
                 self.current_file = file_path
                 self.text_changed = False
+                current_panel.edit_modified(False)
+                self.overview_saved(current_panel)
                 self.update_title()
-                self.update_status(f"Saved as: {os.path.basename(file_path)}")
+                self.update_status(f"Saved as: {os.path.basename(file_path)}{'' if flushed else ' (flushing...)'}")
+                self.dispatch_hook("on_save", self.plugin_context(current_panel, content))
             except Exception as e:
                 messagebox.showerror("Error", f"Could not save file: {e}")
     
+    def write_file(self, file_path, content):
+        """Write content to disk; returns False if it is still being flushed"""
+        # Compressed files are compressed by the write-behind thread, off the UI thread
+        if not fileio.is_slow_path(file_path) and not fileio.compression(file_path):
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            self.stat_cache.invalidate(file_path)
+            return True
+        self.write_behind.save(file_path, content.encode("utf-8"))
+        self.watch_flushes()
+        return False
+    
+    def watch_flushes(self):
+        """Keep the title and status bar in step with background flushes"""
+        if self.flush_watch is None:
+            self.flush_watch = self.root.after(200, self.check_flushes)
+    
+    def check_flushes(self):
+        """Report finished or failed flushes"""
+        self.flush_watch = None
+        for file_path, error in self.write_behind.take_errors().items():
+            messagebox.showerror("Error", f"Could not write {file_path}: {error}\nA copy is kept in {self.write_behind.staging_dir}")
+        self.update_title()
+        if self.write_behind.wait(0):
+            self.update_status("All saves flushed to disk")
+        else:
+            self.watch_flushes()
+    
+    def recover_staged_saves(self):
+        """Flush saves that a previous session staged but never finished writing"""
+        recovered = self.write_behind.recover()
+        if recovered:
+            self.update_status(f"Flushing {len(recovered)} save(s) left from last session")
+            self.watch_flushes()
+    
+    # Compressed files
+    def stream_file(self, file_path):
+        """Decompress a file into the current panel while it is being read"""
+        panel = self.get_current_panel()
+        try:
+            stream = fileio.TextStream(file_path, stat_cache=self.stat_cache)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not open file: {e}")
+            return
+        panel.delete(1.0, tk.END)
+        self.unprotect_panel(panel)
+        # No undo history for the load, and no typing until it is complete
+        panel.config(undo=False, state=tk.DISABLED)
+        self.streams[panel] = {"stream": stream, "path": file_path, "loaded": 0, "limit": fileio.STREAM_LIMIT}
+        self.current_file = file_path
+        self.text_changed = False
+        self.update_title()
+        self.pump_stream(panel)
+    
+    def pump_stream(self, panel):
+        """Move decompressed chunks into the panel for one time slice"""
+        state = self.streams.get(panel)
+        if state is None or "error" in state:
+            return
+        stream = state["stream"]
+        name = os.path.basename(state["path"])
+        finished = False
+        panel.config(state=tk.NORMAL)
+        deadline = time.monotonic() + clipboard.PASTE_SLICE
+        while state["loaded"] < state["limit"] and time.monotonic() < deadline:
+            try:
+                chunk = stream.get()
+            except queue.Empty:
+                break
+            if chunk is None:
+                finished = True
+                break
+            self.append_text(panel, chunk)
+            state["loaded"] += len(chunk)
+        
+        if finished and stream.error is None:
+            del self.streams[panel]
+            panel.config(undo=True)
+            panel.edit_reset()
+            panel.edit_modified(False)
+            self.update_status(f"Opened: {name}")
+            if panel is self.get_current_panel():
+                self.schedule_outline(0)
+                self.schedule_diagnostics(panel, 0)
+            self.reload_overview(panel)
+            if self.plugin_manager.has_subscribers("on_open"):
+                self.dispatch_hook("on_open", self.plugin_context(panel))
+            return
+        panel.config(state=tk.DISABLED)
+        if finished:
+            # What was read stays visible, but saving it would cut the file short
+            state["error"] = stream.error
+            messagebox.showerror("Error", f"Could not read all of {name}: {stream.error}")
+        elif state["loaded"] >= state["limit"]:
+            # The reader waits on its full queue until Load More
+            self.set_status(f"{name}: first {longlines.format_size(state['loaded'])} shown, read-only. File > Load More reads on")
+        else:
+            self.set_status(f"Decompressing {name}... {int(stream.progress() * 100)}%")
+            self.root.after(10, lambda: self.pump_stream(panel))
+    
+    def load_more(self):
+        """Read the next part of a partly loaded compressed file"""
+        panel = self.get_current_panel()
+        state = self.streams.get(panel)
+        if state is None or "error" in state or state["loaded"] < state["limit"]:
+            self.update_status("Nothing more to load")
+            return
+        state["limit"] += fileio.STREAM_LIMIT
+        self.pump_stream(panel)
+    
+    def stop_stream(self, panel):
+        """Abandon loading a compressed file into panel"""
+        state = self.streams.pop(panel, None)
+        if state is not None:
+            state["stream"].cancel()
+            panel.config(state=tk.NORMAL, undo=True)
+            panel.edit_reset()
+    
+    def can_save(self):
+        """Whether the current panel holds its whole file"""
+        if self.get_current_panel() in self.hex_views:
+            messagebox.showinfo("Info", "The hex view only overwrites its file in place; use Save")
+            return False
+        state = self.streams.get(self.get_current_panel())
+        if state is None:
+            return True
+        messagebox.showinfo("Info", f"{os.path.basename(state['path'])} is only partly loaded; saving it now would cut it short")
+        return False
+    
+    def open_paths(self, paths):
+        """Open files handed to us on the command line or by another launch"""
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        for file_path in paths:
+            current_panel = self.get_current_panel()
+            is_empty = current_panel.compare("end-1c", "==", "1.0")
+            if not is_empty and len(self.panels) < 4:
+                self.split_vertical()
+            elif self.text_changed:
+                if messagebox.askyesno("Unsaved Changes", "Save current file?"):
+                    self.save_file()
+            self.load_file(file_path)
+    
+    def poll_instance_requests(self):
+        """Open files forwarded by later launches"""
+        paths = []
+        while True:
+            try:
+                paths.extend(self.instance_requests.get_nowait())
+            except queue.Empty:
+                break
+        if paths or self.instance_requests_raise:
+            self.instance_requests_raise = False
+            self.open_paths(paths)
+        self.root.after(200, self.poll_instance_requests)
+    
+    def instance_request(self, paths):
+        """Called on the listener thread for each forwarded launch"""
+        if not paths:
+            self.instance_requests_raise = True
+        self.instance_requests.put(paths)
+    
     def exit_app(self):
         """Exit the application"""
+        for index, panel in enumerate(list(self.panels)):
+            if self.panel_changed(panel):
+                self.focus_panel(index)
+                name = os.path.basename(self.current_file) if self.current_file else "Untitled"
+                if messagebox.askyesno("Unsaved Changes", f"Save {name} before exiting?"):
+                    self.save_file()
+        for panel in list(self.streams):
+            self.stop_stream(panel)
+        for panel in list(self.hex_views):
+            self.close_hex(panel)
+        self.plugin_manager.shutdown()
+        self.instance_server.stop()
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+        if not self.write_behind.wait(0):
+            self.set_status("Waiting for saves to flush...")
+            self.root.update_idletasks()
+            self.write_behind.wait()
+        self.root.quit()
+    
+    # Plugins
+    def load_plugins(self):
+        """Read plugin headers in the background"""
+        self.run_in_background(self.plugin_manager.read_manifests, lambda result, error: None)
+    
+    def plugin_context(self, panel, text=None):
+        """Snapshot handed to plugin hooks and commands"""
+        return {
+            "path": self.current_file,
+            "text": self.panel_text(panel) if text is None else text,
+            "panel": self.panels.index(panel) if panel in self.panels else 0,
+        }
+    
+    def dispatch_hook(self, hook, context):
+        """Run a plugin hook and show what it reports"""
+        for message in self.plugin_manager.run_hook(hook, context):
+            self.update_status(message)
+        if self.plugin_manager.pending:
+            self.root.after(100, self.poll_plugin_results)
+    
+    def poll_plugin_results(self):
+        """Show results of plugin hooks that ran in worker threads"""
+        for message in self.plugin_manager.poll_results():
+            self.update_status(message)
+        if self.plugin_manager.pending:
+            self.root.after(100, self.poll_plugin_results)
+    
+    def buffer_changed(self):
+        """Tell plugins the current panel changed"""
+        self.buffer_change_job = None
+        self.dispatch_hook("on_buffer_change", self.plugin_context(self.get_current_panel()))
+    
+    def build_plugin_menu(self):
+        """Fill the Plugins menu from plugin headers"""
+        self.plugin_menu.delete(0, tk.END)
+        for plugin, label in self.plugin_manager.commands():
+            self.plugin_menu.add_command(label=label, command=lambda p=plugin, l=label: self.run_plugin_command(p, l))
+        if self.plugin_manager.commands():
+            self.plugin_menu.add_separator()
+        self.plugin_menu.add_command(label="Plugin Timings", command=self.show_plugin_report)
+    
+    def run_plugin_command(self, plugin, label):
+        """Run a plugin command on a snapshot of the current panel, off the UI thread"""
+        context = self.plugin_context(self.get_current_panel())
+        
+        def done(result, error):
+            if isinstance(result, str):
+                self.update_status(result)
+            elif not plugin.enabled:
+                messagebox.showerror("Error", f"Plugin {plugin.name} failed: {plugin.error}")
+        
+        self.update_status(f"Running {label}...")
+        self.run_in_background(lambda: self.plugin_manager.run_command(plugin, label, context), done)
+    
+    def show_plugin_report(self):
+        """Show per-plugin timings"""
+        messagebox.showinfo("Plugin Timings", self.plugin_manager.report())
+    
+    def get_process_pool(self):
+        """Worker process pool, started on first use"""
+        if self.process_pool is None:
+            # Spawned rather than forked: forking a process running Tk threads is unsafe
+            self.process_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self.process_pool
+    
+    # Outline
+    def is_python_panel(self, panel):
+        """Whether the panel holds Python source"""
+        return panel is self.get_current_panel() and bool(self.current_file) and self.current_file.endswith(".py") \
+            and panel not in self.hex_views
+    
+    def toggle_outline(self):
+        """Show or hide the outline pane"""
+        if self.show_outline.get():
+            self.outline_frame.pack(side=tk.RIGHT, fill=tk.Y, before=self.text_frame, padx=(0, 5), pady=5)
+            self.schedule_outline(0)
+        else:
+            self.outline_frame.pack_forget()
+    
+    def schedule_outline(self, delay=500):
+        """Refresh the outline once edits pause"""
+        if self.outline_job:
+            self.root.after_cancel(self.outline_job)
+        self.outline_job = self.root.after(delay, lambda: self.root.after_idle(self.refresh_outline))
+    
+    def refresh_outline(self, on_ready=None):
+        """Parse the current panel in the worker process"""
+        self.outline_job = None
+        panel = self.get_current_panel()
+        if not self.is_python_panel(panel):
+            self.outline_symbols.pop(panel, None)
+            self.show_symbols([])
+            return
+        self.outline_generation += 1
+        generation = self.outline_generation
+        source = panel.get("1.0", "end-1c")
+        pool = self.get_process_pool()
+        
+        def done(symbols, error):
+            # A newer refresh or a panel switch makes this result stale
+            if error or generation != self.outline_generation or panel not in self.panels:
+                return
+            self.outline_symbols[panel] = symbols
+            if panel is self.get_current_panel():
+                self.show_symbols(symbols)
+                if on_ready:
+                    on_ready()
+        
+        self.run_in_background(lambda: pool.submit(outline.outline_document, id(panel), source).result(), done)
+    
+    def show_symbols(self, symbols):
+        """Fill the outline pane"""
+        if not self.show_outline.get():
+            return
+        shown = [(name, line) for _, name, line, _ in symbols]
+        if shown == self.shown_symbols:
+            return
+        self.shown_symbols = shown
+        tree = self.outline_tree
+        tree.delete(*tree.get_children())
+        self.outline_items = {}
+        parents = [""]
+        for kind, name, line, depth in symbols:
+            del parents[depth + 1:]
+            label = name.rsplit(".", 1)[-1] + ("()" if kind != "class" else "")
+            item = tree.insert(parents[min(depth, len(parents) - 1)], tk.END, text=label, open=True)
+            self.outline_items[item] = line
+            parents.append(item)
+    
+    def on_outline_select(self, event=None):
+        """Jump to the selected symbol"""
+        selection = self.outline_tree.selection()
+        if selection and selection[0] in self.outline_items:
+            self.jump_to_line(self.get_current_panel(), self.outline_items[selection[0]])
+    
+    def jump_to_line(self, panel, line):
+        """Move the cursor to the start of a line and show it"""
+        panel.mark_set(tk.INSERT, f"{line}.0")
+        panel.see(tk.INSERT)
+        panel.focus_set()
+    
+    def goto_symbol(self):
+        """Fuzzy jump to a class, function or method"""
+        panel = self.get_current_panel()
+        if not self.is_python_panel(panel):
+            self.update_status("Go to Symbol works on Python files")
+            return
+        
+        symbol_window = tk.Toplevel(self.root)
+        symbol_window.title("Go to Symbol")
+        symbol_window.geometry("400x300")
+        symbol_window.transient(self.root)
+        
+        query_entry = ttk.Entry(symbol_window)
+        query_entry.pack(fill=tk.X, padx=5, pady=5)
+        results_list = tk.Listbox(symbol_window, font=self.editor_font)
+        results_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        query_entry.focus_set()
+        matches = []
+        
+        def update(event=None):
+            symbols = self.outline_symbols.get(panel, [])
+            matches[:] = fuzzy.rank(query_entry.get(), symbols, 100, key=lambda symbol: symbol[1])
+            results_list.delete(0, tk.END)
+            for kind, name, line, _ in matches:
+                results_list.insert(tk.END, f"{name}  ({kind}, line {line})")
+            if matches:
+                results_list.selection_set(0)
+        
+        def choose(event=None):
+            selection = results_list.curselection()
+            if selection:
+                symbol_window.destroy()
+                self.jump_to_line(panel, matches[selection[0]][2])
+        
+        def move(step):
+            selection = results_list.curselection()
+            index = min(max((selection[0] if selection else 0) + step, 0), len(matches) - 1)
+            results_list.selection_clear(0, tk.END)
+            results_list.selection_set(index)
+            results_list.see(index)
+            return "break"
+        
+        query_entry.bind("<KeyRelease>", lambda e: e.keysym in ("Up", "Down", "Return") or update())
+        query_entry.bind("<Return>", choose)
+        query_entry.bind("<Down>", lambda e: move(1))
+        query_entry.bind("<Up>", lambda e: move(-1))
+        query_entry.bind("<Escape>", lambda e: symbol_window.destroy())
+        results_list.bind("<Double-Button-1>", choose)
+        
+        if panel in self.outline_symbols:
+            update()
+        else:
+            self.refresh_outline(on_ready=update)
+    
+    # Diagnostics
+    def schedule_diagnostics(self, panel, delay=400):
+        """Check a panel's Python once edits pause"""
+        self.edit_generations[panel] = self.edit_generations.get(panel, 0) + 1
+        job = self.diagnostic_jobs.pop(panel, None)
+        if job:
+            self.root.after_cancel(job)
+        self.diagnostic_jobs[panel] = self.root.after(delay, lambda: self.root.after_idle(self.check_diagnostics, panel))
+    
+    def check_diagnostics(self, panel):
+        """Check a snapshot of the panel in the worker process"""
+        self.diagnostic_jobs.pop(panel, None)
+        if panel not in self.panels or panel in self.streams or panel in self.unloaded:
+            return
+        if not self.is_python_panel(panel):
+            self.clear_diagnostics(panel)
+            return
+        generation = self.edit_generations.get(panel, 0)
+        source = self.panel_text(panel, "1.0", "end-1c")
+        filename = os.path.basename(self.current_file)
+        pool = self.get_process_pool()
+        
+        def done(found, error):
+            # An edit since the snapshot makes this stale; its own check is already scheduled
+            if error or panel not in self.panels or generation != self.edit_generations.get(panel, 0):
+                return
+            self.diagnostics[panel] = ([diagnostic[1] for diagnostic in found], found)
+            self.tag_diagnostics(panel)
+        
+        self.run_in_background(lambda: pool.submit(diagnostics.check, source, filename).result(), done)
+    
+    def tag_diagnostics(self, panel):
+        """Underline the diagnostics in view; the rest are tagged when scrolled to"""
+        self.diagnostic_tag_jobs.pop(panel, None)
+        if panel not in self.panels:
+            return
+        for tag in ("diagnostic_error", "diagnostic_warning"):
+            panel.tag_remove(tag, "1.0", tk.END)
+        starts, found = self.diagnostics.get(panel, ([], []))
+        if not found:
+            return
+        first = int(panel.index("@0,0").split(".")[0])
+        last = int(panel.index(f"@0,{panel.winfo_height()}").split(".")[0])
+        for severity, line, column, end_line, end_column, _ in \
+                found[bisect.bisect_left(starts, first):bisect.bisect_right(starts, last)]:
+            end = f"{end_line}.{end_column}" if end_column is not None else f"{end_line}.0 lineend"
+            panel.tag_add(f"diagnostic_{severity}", f"{line}.{column}", end)
+    
+    def clear_diagnostics(self, panel):
+        """Drop a panel's diagnostics and their underlines"""
+        if self.diagnostics.pop(panel, None):
+            for tag in ("diagnostic_error", "diagnostic_warning"):
+                panel.tag_remove(tag, "1.0", tk.END)
+    
+    def show_diagnostic(self, panel, event):
+        """Status bar message for the diagnostic under the mouse"""
+        line = int(panel.index(f"@{event.x},{event.y}").split(".")[0])
+        starts, found = self.diagnostics.get(panel, ([], []))
+        end = bisect.bisect_right(starts, line)
+        # Diagnostics spanning several lines start a little above the mouse
+        for severity, first, _, last, _, message in reversed(found[max(end - 20, 0):end]):
+            if first <= line <= last:
+                self.update_status(f"Line {first}: {message}")
+                return
+    
+    # Hex view
+    def open_hex_file(self):
+        """Pick a file and open it in the hex view"""
         if self.text_changed:
-            if messagebox.askyesno("Unsaved Changes", "Save before exiting?"):
+            if messagebox.askyesno("Unsaved Changes", "Save current file?"):
                 self.save_file()
-        self.root.quit()
+        file_path = filedialog.askopenfilename(title="Open in Hex View", filetypes=[("All files", "*.*")])
+        if file_path:
+            self.stop_stream(self.get_current_panel())
+            self.forget_unloaded(self.get_current_panel())
+            self.open_hex(file_path)
+    
+    def open_hex(self, file_path):
+        """Map a file and show it in the current panel as hex rows"""
+        panel = self.get_current_panel()
+        self.close_hex(panel)
+        try:
+            doc = hexview.HexDocument(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not open file: {e}")
+            return
+        self.unprotect_panel(panel)
+        self.clear_multicursor(panel)
+        self.clear_diagnostics(panel)
+        panel.delete("1.0", tk.END)
+        # Rendering rewrites the rows on every scroll; none of that is undoable text
+        panel.config(undo=False, wrap=tk.NONE)
+        panel.edit_reset()
+        panel.edit_modified(False)
+        self.undo_chars.pop(panel, None)
+        self.hex_views[panel] = {"doc": doc, "top": 0, "cursor": 0, "side": "hex", "nibble": 0, "search": None}
+        panel.vbar.config(command=lambda *args: self.hex_scroll(panel, *args))
+        self.current_file = file_path
+        self.text_changed = False
+        self.render_hex(panel)
+        self.update_title()
+        self.schedule_outline(0)
+        self.update_status(f"Opened: {os.path.basename(file_path)} in hex view ({memory.format_bytes(doc.size)})")
+    
+    def close_hex(self, panel):
+        """Unmap a panel's file and give the panel back to text editing"""
+        state = self.hex_views.pop(panel, None)
+        if state is None:
+            return
+        state["doc"].close()
+        self.forget_fold_edits(panel)
+        panel.config(state=tk.NORMAL, undo=True, wrap=tk.WORD)
+        panel.vbar.config(command=panel.yview)
+        panel.delete("1.0", tk.END)
+        panel.edit_reset()
+        panel.edit_modified(False)
+    
+    def hex_rows(self, panel):
+        """Rows that fit in the panel"""
+        return max(panel.winfo_height() // self.editor_font.metrics("linespace"), 1)
+    
+    def render_hex(self, panel):
+        """Put the rows in view into the panel"""
+        state = self.hex_views.get(panel)
+        if state is None:
+            return
+        doc = state["doc"]
+        rows = self.hex_rows(panel)
+        state["top"] = max(min(state["top"], doc.rows - rows), 0)
+        self.forget_fold_edits(panel)
+        panel.config(state=tk.NORMAL)
+        panel.delete("1.0", tk.END)
+        panel.insert("1.0", doc.render(state["top"], rows))
+        
+        # Overwritten bytes in view, then the cursor in both columns
+        first = state["top"] * hexview.ROW_BYTES
+        last = first + rows * hexview.ROW_BYTES
+        for offset, _ in doc.edited(first, last - first):
+            self.hex_tag(panel, "hexedited", offset)
+        self.place_hex_cursor(panel)
+        # Disabled so Text class bindings cannot edit the rendering; hex_key does the editing
+        panel.config(state=tk.DISABLED)
+        self.on_panel_scroll(panel, 0, 1)
+    
+    def hex_tag(self, panel, tag, offset):
+        """Tag one byte's hex and ascii cells"""
+        doc = self.hex_views[panel]["doc"]
+        line = offset // hexview.ROW_BYTES - self.hex_views[panel]["top"] + 1
+        index = offset % hexview.ROW_BYTES
+        column = doc.column(index, "hex")
+        panel.tag_add(tag, f"{line}.{column}", f"{line}.{column + 2}")
+        column = doc.column(index, "ascii")
+        panel.tag_add(tag, f"{line}.{column}", f"{line}.{column + 1}")
+    
+    def place_hex_cursor(self, panel):
+        """Highlight the byte under the cursor"""
+        state = self.hex_views[panel]
+        panel.tag_remove("hexcursor", "1.0", tk.END)
+        if state["doc"].size:
+            self.hex_tag(panel, "hexcursor", state["cursor"])
+        self.set_status(f"Offset 0x{state['cursor']:x} ({state['cursor']})"
+                        f"{' - overwrite' if self.hex_overwrite.get() else ''}")
+    
+    def hex_scroll(self, panel, *args):
+        """Scrollbar command: move through the file by rows"""
+        state = self.hex_views[panel]
+        rows = self.hex_rows(panel)
+        if args[0] == "moveto":
+            state["top"] = int(float(args[1]) * state["doc"].rows)
+        elif args[0] == "scroll":
+            state["top"] += int(args[1]) * (rows if args[2] == "pages" else 1)
+        self.render_hex(panel)
+    
+    def hex_wheel(self, panel, event):
+        """Mouse wheel over the hex view"""
+        if panel not in self.hex_views:
+            return None
+        self.hex_scroll(panel, "scroll", -3 if event.num == 4 or event.delta > 0 else 3, "units")
+        return "break"
+    
+    def hex_move(self, panel, offset):
+        """Move the cursor to offset, scrolling it into view"""
+        state = self.hex_views[panel]
+        state["cursor"] = max(min(offset, state["doc"].size - 1), 0)
+        state["nibble"] = 0
+        row = state["cursor"] // hexview.ROW_BYTES
+        rows = self.hex_rows(panel)
+        if not state["top"] <= row < state["top"] + rows:
+            state["top"] = max(row - rows // 2, 0)
+            self.render_hex(panel)
+        else:
+            self.place_hex_cursor(panel)
+    
+    def hex_click(self, panel, event):
+        """Put the cursor on the clicked byte"""
+        state = self.hex_views[panel]
+        line, column = map(int, panel.index(f"@{event.x},{event.y}").split("."))
+        located = state["doc"].locate(column)
+        if located is not None:
+            index, state["side"] = located
+            self.hex_move(panel, (state["top"] + line - 1) * hexview.ROW_BYTES + index)
+        # Selection still works, for copying rows out
+    
+    def hex_key(self, panel, event):
+        """Navigate, and in overwrite mode edit, the byte under the cursor"""
+        state = self.hex_views[panel]
+        doc = state["doc"]
+        cursor = state["cursor"]
+        page = self.hex_rows(panel) * hexview.ROW_BYTES
+        control = event.state & 0x4
+        moves = {"Left": -1, "Right": 1, "Up": -hexview.ROW_BYTES, "Down": hexview.ROW_BYTES,
+                 "Prior": -page, "Next": page}
+        if event.keysym in moves:
+            self.hex_move(panel, cursor + moves[event.keysym])
+        elif event.keysym == "Home":
+            self.hex_move(panel, 0 if control else cursor - cursor % hexview.ROW_BYTES)
+        elif event.keysym == "End":
+            self.hex_move(panel, doc.size - 1 if control else cursor - cursor % hexview.ROW_BYTES + hexview.ROW_BYTES - 1)
+        elif event.keysym == "Tab":
+            state["side"] = "ascii" if state["side"] == "hex" else "hex"
+            self.update_status(f"Typing goes to the {state['side']} column")
+        elif event.keysym == "Insert":
+            self.hex_overwrite.set(not self.hex_overwrite.get())
+            self.place_hex_cursor(panel)
+        elif control or not event.char:
+            return None  # Shortcuts; the disabled panel ignores their Text class editing
+        elif self.hex_overwrite.get() and doc.size:
+            self.hex_type(panel, event.char)
+        return "break"
+    
+    def hex_type(self, panel, char):
+        """Overwrite the byte under the cursor with a typed hex digit or character"""
+        state = self.hex_views[panel]
+        doc = state["doc"]
+        cursor = state["cursor"]
+        value = doc.read(cursor, 1)[0]
+        if state["side"] == "hex":
+            if char not in "0123456789abcdefABCDEF":
+                return
+            digit = int(char, 16)
+            # First digit sets the high nibble, second the low one and moves on
+            if state["nibble"] == 0:
+                doc.overwrite(cursor, digit << 4 | value & 0x0F)
+                state["nibble"] = 1
+            else:
+                doc.overwrite(cursor, value & 0xF0 | digit)
+                state["nibble"] = 0
+        elif " " <= char <= "~":
+            doc.overwrite(cursor, ord(char))
+        else:
+            return
+        self.text_changed = bool(doc.pending)
+        self.update_title()
+        self.render_hex(panel)
+        if state["nibble"] == 0:
+            self.hex_move(panel, cursor + 1)
+    
+    def hex_undo(self, panel):
+        """Take back the last overwrite"""
+        doc = self.hex_views[panel]["doc"]
+        offset = doc.undo()
+        if offset is None:
+            return
+        self.text_changed = bool(doc.pending)
+        self.update_title()
+        self.render_hex(panel)
+        self.hex_move(panel, offset)
+    
+    def save_hex(self, panel):
+        """Write overwritten bytes into the mapped file"""
+        doc = self.hex_views[panel]["doc"]
+        try:
+            saved = doc.save()
+        except (OSError, ValueError, IndexError) as e:
+            messagebox.showerror("Error", f"Could not save file: {e}")
+            return
+        self.text_changed = False
+        self.update_title()
+        self.render_hex(panel)
+        self.update_status(f"Saved: {os.path.basename(doc.path)} ({saved} bytes overwritten in place)")
+    
+    def hex_goto(self):
+        """Move the hex cursor to an offset"""
+        panel = self.get_current_panel()
+        if panel not in self.hex_views:
+            self.update_status("Go to Offset works in the hex view")
+            return
+        text = simpledialog.askstring("Go to Offset", "Offset (1234, 0x4d2, or +/- either):", parent=self.root)
+        if not text:
+            return
+        try:
+            offset = hexview.parse_offset(text, self.hex_views[panel]["cursor"])
+        except ValueError:
+            messagebox.showerror("Error", f"Not an offset: {text}")
+            return
+        self.hex_move(panel, offset)
+    
+    def hex_find(self):
+        """Find bytes in the mapped file, a window of the map per time slice"""
+        panel = self.get_current_panel()
+        text = simpledialog.askstring("Find Bytes", "Hex bytes (de ad be ef) or \"quoted text\":",
+                                      initialvalue=self.hex_needle, parent=self.root)
+        if not text:
+            return
+        self.hex_needle = text
+        state = self.hex_views[panel]
+        needle = hexview.parse_needle(text)
+        search = state["doc"].search(needle, state["cursor"] + 1)
+        state["search"] = search
+        
+        def step():
+            # Closing the view or starting another search calls this one off
+            if self.hex_views.get(panel) is not state or state["search"] is not search:
+                return
+            deadline = time.monotonic() + hexview.SEARCH_SLICE
+            for found in search:
+                if found is not None:
+                    break
+                if time.monotonic() >= deadline:
+                    self.set_status(f"Searching for {text}...")
+                    self.root.after(1, step)
+                    return
+            state["search"] = None
+            if found == -1:
+                self.update_status(f"Not found: {text}")
+            else:
+                self.hex_move(panel, found)
+        
+        step()
+    
+    # Memory accounting
+    def char_count(self, panel):
+        """Characters in a panel, counted by Tk without copying the text"""
+        return int(panel.tk.call(str(panel), "count", "-chars", "1.0", "end-1c"))
+    
+    def note_undo(self, panel, chars):
+        """Count characters that went into a panel's undo history"""
+        self.undo_chars[panel] = self.undo_chars.get(panel, 0) + chars
+    
+    def panel_usage(self, panel):
+        """What a panel holds, for memory.estimate"""
+        extra = sum(len(remainder) for remainder in self.elisions.get(panel, {}).values())
+        if panel in self.overviews:
+            extra += len(self.overviews[panel]["index"]) * 9
+        if panel in self.unloaded:
+            extra += len(self.unloaded[panel].data)
+        if panel in self.fold_indexes:
+            extra += len(self.fold_indexes[panel]) * 20
+        return {
+            "chars": self.char_count(panel),
+            "lines": int(panel.index("end-1c").split(".")[0]),
+            "tag_ranges": sum(len(panel.tag_ranges(tag)) // 2 for tag in panel.tag_names()),
+            "marks": len(panel.mark_names()),
+            "undo_chars": self.undo_chars.get(panel, 0),
+            "extra": extra,
+        }
+    
+    def show_memory_usage(self):
+        """Table of what each panel costs"""
+        window = tk.Toplevel(self.root)
+        window.title("Memory Usage")
+        window.geometry("720x260")
+        window.transient(self.root)
+        columns = ("state", "text", "lines", "tags", "marks", "undo", "total")
+        headings = ("State", "Text", "Lines", "Tag ranges", "Marks", "Undo (est.)", "Total (est.)")
+        table = ttk.Treeview(window, columns=columns, height=5)
+        table.heading("#0", text="Panel")
+        table.column("#0", width=80)
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=85, anchor=tk.E)
+        table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        summary = ttk.Label(window, anchor=tk.W)
+        summary.pack(fill=tk.X, padx=5)
+        
+        def refresh():
+            table.delete(*table.get_children())
+            total = 0
+            for number, panel in enumerate(self.panels, 1):
+                usage = self.panel_usage(panel)
+                size = memory.estimate(usage)
+                total += size
+                if panel in self.unloaded:
+                    state = "unloaded"
+                elif panel in self.streams:
+                    state = "loading"
+                else:
+                    state = "modified" if panel.edit_modified() else "loaded"
+                table.insert("", tk.END, text=f"Panel {number}", values=(
+                    state,
+                    memory.format_bytes(usage["chars"]),
+                    f"{usage['lines']:,}",
+                    f"{usage['tag_ranges']:,}",
+                    f"{usage['marks']:,}",
+                    memory.format_bytes(usage["undo_chars"] * memory.UNDO_CHAR_COST),
+                    memory.format_bytes(size),
+                ))
+            rss = memory.resident_bytes()
+            summary.config(text=f"Panels: {memory.format_bytes(total)}" +
+                           (f"    Process: {memory.format_bytes(rss)}" if rss else ""))
+        
+        def unload_now():
+            self.unload_idle_panels(force=True)
+            window.after(500, refresh)
+        
+        buttons = ttk.Frame(window)
+        buttons.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Unload Inactive Panels", command=unload_now).pack(side=tk.LEFT, padx=5)
+        refresh()
+    
+    def update_memory_label(self):
+        """Show panel and process memory at the right of the status bar while enabled"""
+        if self.memory_label_job:
+            self.root.after_cancel(self.memory_label_job)
+            self.memory_label_job = None
+        if not self.show_memory.get():
+            self.memory_label.place_forget()
+            return
+        total = sum(memory.estimate(self.panel_usage(panel)) for panel in self.panels)
+        rss = memory.resident_bytes()
+        self.memory_label.config(text=f"Panels {memory.format_bytes(total)}" +
+                                 (f" | RSS {memory.format_bytes(rss)}" if rss else ""))
+        self.memory_label.place(relx=1.0, rely=0.5, anchor=tk.E)
+        self.memory_label_job = self.root.after(5000, self.update_memory_label)
+    
+    def check_memory(self):
+        """Periodic unloading of panels nobody is looking at"""
+        self.root.after(memory.CHECK_INTERVAL_MS, self.check_memory)
+        self.unload_idle_panels()
+    
+    def unload_idle_panels(self, force=False):
+        """Unload unmodified panels that have not had focus for a while"""
+        now = time.monotonic()
+        focused = self.root.focus_get()
+        for panel in self.panels:
+            if panel is self.get_current_panel() or panel is focused or panel.edit_modified():
+                continue
+            if panel in self.unloaded or panel in self.unloading or panel in self.streams or \
+                    panel in self.pasting or panel in self.multicursors:
+                continue
+            if not force and now - self.focus_times.get(panel, now) < memory.IDLE_SECONDS:
+                continue
+            if memory.estimate(self.panel_usage(panel)) >= memory.UNLOAD_MIN_BYTES:
+                self.unload_panel(panel)
+    
+    def unload_panel(self, panel):
+        """Compress a panel's text in the background, then empty the widget"""
+        text = self.panel_text(panel, "1.0", "end-1c")
+        protected = panel in self.elisions
+        insert = panel.index(tk.INSERT)
+        view = panel.yview()[0]
+        self.unloading.add(panel)
+        
+        def done(unloaded, error):
+            self.unloading.discard(panel)
+            # Focus or an edit while compressing calls it off
+            if error or panel not in self.panels or panel.edit_modified() or \
+                    panel is self.root.focus_get() or panel is self.get_current_panel():
+                return
+            self.unloaded[panel] = unloaded
+            self.unprotect_panel(panel)
+            panel.tag_remove("found", "1.0", tk.END)
+            panel.delete("1.0", tk.END)
+            panel.insert("1.0", f"[Unloaded to save memory ({memory.format_bytes(unloaded.size)}). Click to restore]")
+            panel.edit_reset()
+            panel.edit_modified(False)
+            panel.config(state=tk.DISABLED)
+            self.undo_chars.pop(panel, None)
+            self.outline_symbols.pop(panel, None)
+            self.fold_indexes.pop(panel, None)
+            self.diagnostics.pop(panel, None)
+            self.reload_overview(panel)
+        
+        self.run_in_background(lambda: memory.Unloaded(text, protected, insert, view), done)
+    
+    def restore_panel(self, panel):
+        """Put an unloaded panel's text back"""
+        unloaded = self.unloaded.pop(panel, None)
+        if unloaded is None:
+            return
+        text = unloaded.text()
+        self.forget_fold_edits(panel)
+        panel.config(state=tk.NORMAL)
+        panel.delete("1.0", tk.END)
+        if unloaded.protected:
+            self.protect_panel(panel, text)
+        else:
+            panel.insert("1.0", text)
+        panel.edit_reset()
+        panel.edit_modified(False)
+        panel.mark_set(tk.INSERT, unloaded.insert)
+        panel.yview_moveto(unloaded.view)
+        self.reload_overview(panel, text)
+        if self.is_python_panel(panel):
+            self.schedule_diagnostics(panel, 0)
+    
+    def forget_unloaded(self, panel):
+        """Drop an unloaded panel's text because something else is replacing it"""
+        if self.unloaded.pop(panel, None) is not None:
+            panel.config(state=tk.NORMAL)
+    
+    def on_panel_focus(self, panel):
+        """Note when a panel was last used and bring it back if it was unloaded"""
+        self.focus_times[panel] = time.monotonic()
+        if panel in self.panels and panel is not self.get_current_panel():
+            # Clicking into a panel makes it current, with its own file
+            self.set_current_panel(self.panels.index(panel))
+            self.update_title()
+        self.restore_panel(panel)
+    
+    # Folding
+    def note_fold_edit(self, panel):
+        """Widen the edited line range to the cursor and selection, before a key edits there"""
+        edited = self.fold_edits.get(panel)
+        if edited is None:
+            return  # A full diff is due anyway
+        positions = [panel.index(tk.INSERT)] + [str(position) for position in panel.tag_ranges("sel")]
+        if not edited:
+            # Marks follow the text, so the range stays right as lines come and go
+            panel.mark_set("fold_first", f"{positions[0]} linestart")
+            panel.mark_gravity("fold_first", tk.LEFT)
+            panel.mark_set("fold_last", f"{positions[0]} lineend")
+            panel.mark_gravity("fold_last", tk.RIGHT)
+            self.fold_edits[panel] = True
+        for position in positions:
+            if panel.compare(position, "<", "fold_first"):
+                panel.mark_set("fold_first", f"{position} linestart")
+            if panel.compare(position, ">", "fold_last"):
+                panel.mark_set("fold_last", f"{position} lineend")
+    
+    def forget_fold_edits(self, panel):
+        """The text changed somewhere only a full diff can find"""
+        self.fold_edits.pop(panel, None)
+    
+    def fold_regions(self, panel):
+        """Fold index of a panel, brought up to date with its text"""
+        index = self.fold_indexes.get(panel)
+        edited = self.fold_edits.get(panel)
+        if index is None or edited is None:
+            index = self.fold_indexes.setdefault(panel, folding.FoldIndex())
+            index.update(panel.get("1.0", "end-1c"))
+        elif edited:
+            # Only the lines between the marks changed; the rest moved by the change in line count
+            first = int(panel.index("fold_first").split(".")[0])
+            last = int(panel.index("fold_last").split(".")[0])
+            count = last - first + 1 - (int(panel.index("end-1c").split(".")[0]) - len(index))
+            if count >= 0 and first - 1 + count <= len(index):
+                index.splice(first - 1, count, panel.get(f"{first}.0", f"{last}.0 lineend").split("\n"))
+            else:
+                index.update(panel.get("1.0", "end-1c"))
+        self.fold_edits[panel] = False
+        return index
+    
+    def toggle_fold(self):
+        """Fold or unfold the innermost region at the cursor"""
+        panel = self.get_current_panel()
+        line = int(panel.index(tk.INSERT).split(".")[0])
+        region = self.fold_regions(panel).region_at(line - 1)
+        if region is None:
+            self.update_status("Nothing to fold here")
+            return
+        header, last = region[0] + 1, region[1] + 1
+        # The header keeps its text; its newline and the region's lines are hidden
+        start, end = f"{header}.0 lineend", f"{last}.0 lineend"
+        if "fold" in panel.tag_names(start):
+            panel.tag_remove("fold", start, end)
+            panel.tag_remove("folded", f"{header}.0", start)
+        else:
+            panel.tag_add("fold", start, end)
+            panel.tag_add("folded", f"{header}.0", start)
+            panel.mark_set(tk.INSERT, start)
+        panel.see(tk.INSERT)
+    
+    def fold_all(self):
+        """Fold every region with one tag_add"""
+        panel = self.get_current_panel()
+        regions = self.fold_regions(panel).regions()
+        if not regions:
+            return
+        hidden, headers = [], []
+        for header, last in regions:
+            hidden.extend((f"{header + 1}.0 lineend", f"{last + 1}.0 lineend"))
+            headers.extend((f"{header + 1}.0", f"{header + 1}.0 lineend"))
+        panel.tag_add("fold", *hidden)
+        panel.tag_add("folded", *headers)
+        if "fold" in panel.tag_names(tk.INSERT):
+            # Back out of the hidden lines to the end of their header
+            panel.mark_set(tk.INSERT, panel.tag_prevrange("fold", f"{tk.INSERT}+1c")[0])
+        panel.see(tk.INSERT)
+        self.update_status(f"Folded {len(regions)} region(s)")
+    
+    def unfold_all(self):
+        """Show every folded line with one tag_remove"""
+        panel = self.get_current_panel()
+        panel.tag_remove("fold", "1.0", tk.END)
+        panel.tag_remove("folded", "1.0", tk.END)
+    
+    # Overview ruler
+    def toggle_overview(self):
+        """Show or hide the overview ruler on every panel"""
+        for panel in self.panels:
+            if self.show_overview.get():
+                self.attach_overview(panel)
+            else:
+                self.detach_overview(panel)
+    
+    def attach_overview(self, panel):
+        """Add a ruler between the panel and its scrollbar"""
+        if panel in self.overviews:
+            return
+        canvas = tk.Canvas(panel.frame, width=60, highlightthickness=0, background=self.theme_options["background"])
+        canvas.pack(side=tk.RIGHT, fill=tk.Y, before=panel)
+        canvas.bind("<Configure>", lambda e: self.redraw_overview(panel))
+        canvas.bind("<Button-1>", lambda e: self.overview_jump(panel, e))
+        canvas.bind("<B1-Motion>", lambda e: self.overview_jump(panel, e))
+        self.overviews[panel] = {
+            "canvas": canvas,
+            "index": overview.DensityIndex(),
+            "job": None,
+            "dirty": set(),
+            "resync": False,
+            "line": 1,
+        }
+        self.reload_overview(panel)
+    
+    def detach_overview(self, panel):
+        """Remove a panel's ruler"""
+        state = self.overviews.pop(panel, None)
+        if state is None:
+            return
+        if state["job"]:
+            self.root.after_cancel(state["job"])
+        state["canvas"].destroy()
+    
+    def reload_overview(self, panel, content=None):
+        """Measure every line again, e.g. after loading a file"""
+        state = self.overviews.get(panel)
+        if state is None:
+            return
+        state["index"].load(panel.get("1.0", "end-1c") if content is None else content)
+        state["dirty"] = set()
+        state["resync"] = False
+        state["line"] = int(panel.index(tk.INSERT).split(".")[0])
+        self.redraw_overview(panel)
+    
+    def schedule_overview(self, panel, lines=(), resync=False):
+        """Update the ruler once typing pauses; lines are known to have changed"""
+        state = self.overviews.get(panel)
+        if state is None:
+            return
+        state["dirty"].update(lines)
+        state["resync"] = state["resync"] or resync
+        if state["job"]:
+            self.root.after_cancel(state["job"])
+        state["job"] = self.root.after(150, lambda: self.update_overview(panel))
+    
+    def update_overview(self, panel):
+        """Re-measure the lines around the cursor instead of the whole text"""
+        state = self.overviews.get(panel)
+        if state is None:
+            return
+        if state["job"]:
+            self.root.after_cancel(state["job"])
+            state["job"] = None
+        index = state["index"]
+        dirty, state["dirty"] = state["dirty"], set()
+        line_count = int(panel.index("end-1c").split(".")[0])
+        insert_line = int(panel.index(tk.INSERT).split(".")[0])
+        delta = line_count - len(index)
+        if state["resync"]:
+            index.load(panel.get("1.0", "end-1c"))
+            state["resync"] = False
+        elif delta == 0:
+            lines = sorted(line for line in dirty | {insert_line, state["line"]} if line <= line_count)
+            index.update_lengths([line - 1 for line in lines], [self.line_length(panel, line) for line in lines])
+        elif not dirty and delta > 0 and insert_line - delta >= 1:
+            # Lines typed or pasted, ending at the cursor
+            first = insert_line - delta
+            text = panel.get(f"{first}.0", f"{insert_line}.0 lineend")
+            index.replace_lines(first - 1, 1, [len(line) for line in text.split("\n")])
+        elif not dirty and delta < 0 and insert_line - delta <= len(index):
+            # Lines joined at the cursor
+            index.replace_lines(insert_line - 1, 1 - delta, [self.line_length(panel, insert_line)])
+        else:
+            index.load(panel.get("1.0", "end-1c"))
+        state["line"] = insert_line
+        self.redraw_overview(panel)
+    
+    def line_length(self, panel, line):
+        """Characters on a line, without fetching its text"""
+        return int(panel.index(f"{line}.0 lineend").split(".")[1])
+    
+    def show_overview_matches(self, panel):
+        """Mark the lines holding find hits"""
+        ranges = panel.tag_ranges("found")
+        self.overviews[panel]["index"].set_matches([int(str(start).split(".")[0]) - 1 for start in ranges[::2]])
+        self.redraw_overview(panel)
+    
+    def overview_saved(self, panel):
+        """Edit marks show changes since the last save"""
+        if panel in self.overviews:
+            self.update_overview(panel)
+            self.overviews[panel]["index"].clear_edited()
+            self.redraw_overview(panel)
+    
+    def redraw_overview(self, panel):
+        """Draw the ruler from the bucket arrays"""
+        state = self.overviews.get(panel)
+        if state is None:
+            return
+        canvas = state["canvas"]
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        colors = themes.THEMES[self.theme_name.get()]
+        canvas.configure(background=colors["background"])
+        canvas.delete("all")
+        for top, bottom, fraction, matches, edited in state["index"].rows(height):
+            bottom = max(bottom, top + 1)
+            if fraction:
+                canvas.create_rectangle(4, top, 4 + (width - 12) * fraction, bottom, fill=colors["muted"], outline="")
+            if edited:
+                canvas.create_rectangle(0, top, 3, bottom, fill=colors["modified"], outline="")
+            if matches:
+                canvas.create_rectangle(width - 6, top, width, max(bottom, top + 2), fill=colors["found"], outline="")
+        canvas.create_rectangle(0, 0, 0, 0, outline=colors["foreground"], tags="viewport")
+        self.on_panel_scroll(panel, *panel.yview())
+    
+    def on_panel_scroll(self, panel, first, last):
+        """Keep the scrollbar and the overview viewport in step with the panel"""
+        hex_state = self.hex_views.get(panel)
+        if hex_state is not None:
+            # The panel holds only the rows in view; the scrollbar spans the whole file
+            rows = max(hex_state["doc"].rows, 1)
+            first = hex_state["top"] / rows
+            last = min((hex_state["top"] + self.hex_rows(panel)) / rows, 1.0)
+        panel.vbar.set(first, last)
+        if self.diagnostics.get(panel) and panel not in self.diagnostic_tag_jobs:
+            # Throttled: tagging follows a scroll at most every 50ms
+            self.diagnostic_tag_jobs[panel] = self.root.after(50, lambda: self.tag_diagnostics(panel))
+        state = self.overviews.get(panel)
+        if state is not None:
+            canvas = state["canvas"]
+            height = canvas.winfo_height()
+            canvas.coords("viewport", 0, float(first) * height, canvas.winfo_width() - 1, float(last) * height)
+    
+    def overview_jump(self, panel, event):
+        """Scroll so the clicked spot is in the middle of the view"""
+        height = max(event.widget.winfo_height(), 1)
+        first, last = panel.yview()
+        panel.yview_moveto(max(event.y / height - (last - first) / 2, 0))
+    
+    # Long-line protection
+    def protect_panel(self, panel, content):
+        """Load content with wrapping off and very long lines cut short"""
+        self.forget_fold_edits(panel)
+        panel.config(wrap=tk.NONE)
+        display, elisions = longlines.elide_long_lines(content)
+        panel.insert(1.0, display)
+        
+        self.elisions[panel] = {}
+        for number, column, remainder in elisions:
+            self.add_elision(panel, number, column, remainder)
+        panel.edit_reset()
+    
+    def add_elision(self, panel, number, column, remainder):
+        """Hide remainder behind a clickable marker at number.column"""
+        tag = f"elided{number}_{column}"
+        panel.insert(f"{number}.{column}", self.elision_marker(remainder), ("elided", tag))
+        panel.tag_add("longline", f"{number}.0", f"{number}.0 lineend")
+        panel.tag_bind(tag, "<Button-1>", lambda e, p=panel, t=tag: self.expand_elision(p, t))
+        self.elisions[panel][tag] = remainder
+    
+    def append_text(self, panel, content):
+        """Add text at the end of a panel, protecting it from long lines like load_file does"""
+        self.forget_fold_edits(panel)
+        line, column = map(int, panel.index("end-1c").split("."))
+        display, elisions = longlines.elide_long_lines(content)
+        panel.insert("end-1c", display)
+        if elisions and panel not in self.elisions:
+            panel.config(wrap=tk.NONE)
+            self.elisions[panel] = {}
+        for number, elided_column, remainder in elisions:
+            if number == 1:
+                elided_column += column
+            self.add_elision(panel, line + number - 1, elided_column, remainder)
+    
+    def unprotect_panel(self, panel):
+        """Return a panel to normal mode"""
+        self.forget_fold_edits(panel)
+        hidden = self.elisions.pop(panel, None)
+        if hidden is not None:
+            for tag in hidden:
+                panel.tag_delete(tag)
+            panel.tag_remove("longline", "1.0", tk.END)
+            panel.config(wrap=tk.WORD)
+    
+    def elision_marker(self, remainder):
+        """Text shown in place of the hidden part of a line"""
+        return f" \u2026 [+{longlines.format_size(len(remainder))}, click to expand]"
+    
+    def expand_elision(self, panel, tag):
+        """Reveal the next part of an elided line"""
+        hidden = self.elisions.get(panel)
+        ranges = panel.tag_ranges(tag)
+        if not hidden or tag not in hidden or not ranges:
+            return "break"
+        remainder = hidden[tag]
+        shown, rest = remainder[:longlines.EXPAND_STEP], remainder[longlines.EXPAND_STEP:]
+        self.forget_fold_edits(panel)
+        first, last = ranges
+        # Kept off the undo stack: undoing it would bring the marker back without its remainder
+        panel.config(undo=False)
+        panel.delete(first, last)
+        panel.insert(first, shown, "longline")
+        if rest:
+            hidden[tag] = rest
+            panel.insert(f"{first}+{len(shown)}c", self.elision_marker(rest), ("elided", tag))
+        else:
+            del hidden[tag]
+            panel.tag_delete(tag)
+        panel.config(undo=True)
+        return "break"
+    
+    def panel_text(self, panel, start="1.0", end=tk.END):
+        """Text of a panel, with the hidden rest of elided lines put back"""
+        hidden = self.elisions.get(panel)
+        if not hidden:
+            return panel.get(start, end)
+        markers = []
+        for tag, remainder in hidden.items():
+            ranges = panel.tag_ranges(tag)
+            if ranges and panel.compare(ranges[0], ">=", start) and panel.compare(ranges[1], "<=", end):
+                line, column = map(int, str(ranges[0]).split("."))
+                markers.append(((line, column), ranges[0], ranges[1], remainder))
+        markers.sort(key=lambda marker: marker[0])
+        
+        parts = []
+        position = start
+        for _, first, last, remainder in markers:
+            parts.append(panel.get(position, first))
+            parts.append(remainder)
+            position = last
+        parts.append(panel.get(position, end))
+        return "".join(parts)
+    
+    # Export
+    def export_file(self):
+        """Export the current panel to HTML or PDF in the background"""
+        panel = self.get_current_panel()
+        file_path = filedialog.asksaveasfilename(
+            title="Export",
+            defaultextension=".html",
+            filetypes=[
+                ("HTML files", "*.html"),
+                ("PDF files", "*.pdf")
+            ]
+        )
+        if not file_path:
+            return
+        exporter_class = export.EXPORTERS.get(os.path.splitext(file_path)[1].lower())
+        if exporter_class is None:
+            messagebox.showerror("Error", "Export supports .html and .pdf files")
+            return
+        
+        title = os.path.basename(self.current_file) if self.current_file else "Untitled"
+        page_style, tag_styles = self.theme_options, self.theme_tags
+        # Elided lines shift columns, so their spans are not carried over
+        tags = [] if panel in self.elisions else list(tag_styles)
+        total_lines = int(panel.index("end-1c").split(".")[0])
+        chunks = queue.Queue(maxsize=export.QUEUE_SIZE)
+        state = {"line": 1, "finished": False}
+        
+        def work():
+            if exporter_class.binary:
+                file = open(file_path, "wb")
+            else:
+                file = open(file_path, "w", encoding="utf-8", newline="")
+            with file:
+                exporter = exporter_class(file, title, page_style, tag_styles)
+                exporter.begin()
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        break
+                    exporter.write_chunk(*chunk)
+                exporter.end()
+        
+        def done(result, error):
+            state["finished"] = True
+            if error:
+                messagebox.showerror("Error", f"Could not export file: {error}")
+            else:
+                self.update_status(f"Exported: {os.path.basename(file_path)}")
+        
+        def produce():
+            # Read a few chunks per tick; the bounded queue keeps memory flat
+            if state["finished"]:
+                return
+            while not chunks.full():
+                line = state["line"]
+                if line > total_lines or panel not in self.panels:
+                    chunks.put(None)
+                    return
+                last = min(line + export.CHUNK_LINES, total_lines + 1)
+                start, end = f"{line}.0", f"{last}.0"
+                text = self.panel_text(panel, start, end)
+                chunks.put((text, self.tag_spans(panel, tags, text, start, end)))
+                state["line"] = last
+                self.set_status(f"Exporting... {(last - 1) * 100 // total_lines}%")
+            self.root.after(10, produce)
+        
+        self.run_in_background(work, done)
+        produce()
+    
+    def tag_spans(self, panel, tags, text, start, end):
+        """Ranges of tags between start and end as (start, end, tag) offsets into text"""
+        spans = []
+        line_starts = None
+        first_line = int(start.split(".")[0])
+        
+        def offset(index):
+            line, column = map(int, str(index).split("."))
+            if line - first_line >= len(line_starts):
+                return len(text)
+            return min(line_starts[line - first_line] + column, len(text))
+        
+        for tag in tags:
+            position = start
+            # A range that began in an earlier chunk
+            if tag in panel.tag_names(start):
+                position = panel.tag_prevrange(tag, f"{start}+1c")[1]
+            found = panel.tag_nextrange(tag, position, end)
+            if position == start and not found:
+                continue
+            if line_starts is None:
+                line_starts = [0]
+                for line in text.split("\n"):
+                    line_starts.append(line_starts[-1] + len(line) + 1)
+            if position != start:
+                spans.append((0, offset(position), tag))
+            while found:
+                spans.append((offset(found[0]), offset(found[1]), tag))
+                found = panel.tag_nextrange(tag, found[1], end)
+        return spans
     
     # Edit operations
     def undo(self):
         """Undo last action"""
         try:
             current_panel = self.get_current_panel()
+            if current_panel in self.pasting:
+                return
+            if current_panel in self.hex_views:
+                self.hex_undo(current_panel)
+                return
+            self.clear_multicursor(current_panel)
+            self.forget_fold_edits(current_panel)
             current_panel.edit_undo()
+            self.schedule_overview(current_panel, resync=True)
         except tk.TclError:
             pass
     
@@ -327,7 +2110,12 @@ class SimplyNoteIt:
         """Redo last undone action"""
         try:
             current_panel = self.get_current_panel()
+            if current_panel in self.pasting:
+                return
+            self.clear_multicursor(current_panel)
+            self.forget_fold_edits(current_panel)
             current_panel.edit_redo()
+            self.schedule_overview(current_panel, resync=True)
         except tk.TclError:
             pass
     
@@ -346,6 +2134,101 @@ class SimplyNoteIt:
         current_panel = self.get_current_panel()
         current_panel.event_generate("<<Paste>>")
     
+    def on_copy(self, panel, cut=False):
+        """Copy or cut the selection; large selections are handed out lazily"""
+        if panel in self.pasting:
+            return "break"
+        cut = cut and panel not in self.hex_views
+        if cut:
+            self.forget_fold_edits(panel)
+        try:
+            size = int(panel.tk.call(str(panel), "count", "-chars", "sel.first", "sel.last"))
+        except tk.TclError:
+            return "break"  # No selection
+        if size < clipboard.LARGE_COPY or not self.x11:
+            panel.tk.call("tk_textCut" if cut else "tk_textCopy", str(panel))
+            if cut:
+                # Returning "break" keeps the KeyPress binding from seeing the edit
+                self.on_text_change()
+            return "break"
+        # One copy of the text; other applications fetch it in pieces on paste
+        self.lazy_clipboard.set(panel.get("sel.first", "sel.last"))
+        self.root.selection_own(selection="CLIPBOARD", command=self.lazy_clipboard.clear)
+        if cut:
+            self.single_undo_step(panel, lambda: panel.delete("sel.first", "sel.last"))
+            self.note_undo(panel, size)
+            self.on_text_change()
+        self.update_status(f"{'Cut' if cut else 'Copied'} {longlines.format_size(size)}")
+        return "break"
+    
+    def on_paste(self, panel):
+        """Paste; large clipboard contents go in slice by slice"""
+        if panel in self.pasting or panel in self.hex_views:
+            return "break"
+        if self.lazy_clipboard.owns():
+            text = self.lazy_clipboard.text
+        else:
+            try:
+                text = panel.clipboard_get()
+            except tk.TclError:
+                return "break"
+        self.forget_fold_edits(panel)
+        if len(text) < clipboard.LARGE_PASTE:
+            panel.tk.call("tk_textPaste", str(panel))
+            self.on_text_change()
+        else:
+            self.paste_in_chunks(panel, text)
+        return "break"
+    
+    def paste_in_chunks(self, panel, text):
+        """Insert text a time slice at a time as one undo step, with progress"""
+        self.clear_multicursor(panel)
+        self.pasting.add(panel)
+        panel.config(autoseparators=False)
+        panel.edit_separator()
+        if not self.x11:
+            try:
+                panel.delete("sel.first", "sel.last")
+            except tk.TclError:
+                pass
+        panel.mark_set("paste_end", tk.INSERT)
+        panel.mark_gravity("paste_end", tk.RIGHT)
+        # Disabled between slices so typing cannot land inside the paste
+        panel.config(state=tk.DISABLED)
+        position = 0
+        
+        def step():
+            nonlocal position
+            if panel not in self.panels:
+                self.pasting.discard(panel)
+                return
+            panel.config(state=tk.NORMAL)
+            deadline = time.monotonic() + clipboard.PASTE_SLICE
+            while position < len(text) and time.monotonic() < deadline:
+                end = clipboard.chunk_end(text, position)
+                panel.insert("paste_end", text[position:end])
+                position = end
+            if position < len(text):
+                panel.config(state=tk.DISABLED)
+                self.set_status(f"Pasting... {position * 100 // len(text)}%")
+                self.root.after(1, step)
+                return
+            panel.edit_separator()
+            panel.config(autoseparators=True)
+            panel.mark_set(tk.INSERT, "paste_end")
+            panel.mark_unset("paste_end")
+            panel.see(tk.INSERT)
+            self.pasting.discard(panel)
+            self.note_undo(panel, len(text))
+            self.text_changed = True
+            self.update_title()
+            self.schedule_overview(panel, resync=True)
+            if self.is_python_panel(panel):
+                self.schedule_diagnostics(panel)
+            self.update_status(f"Pasted {longlines.format_size(len(text))}")
+        
+        step()
+    
     def select_all(self):
         """Select all text"""
         current_panel = self.get_current_panel()
@@ -355,6 +2238,9 @@ class SimplyNoteIt:
     
     def find_text(self):
         """Find text dialog"""
+        if self.get_current_panel() in self.hex_views:
+            self.hex_find()
+            return
         # Simple find dialog
         find_window = tk.Toplevel(self.root)
         find_window.title("Find")
@@ -381,11 +2267,13 @@ class SimplyNoteIt:
                     if not pos:
                         break
                     end = f"{pos}+{len(search_text)}c"
-                    current_panel.tag_add("found", pos, end)
+                    # No highlighting on elided long lines
+                    if "longline" not in current_panel.tag_names(pos):
+                        current_panel.tag_add("found", pos, end)
                     start = end
                 
-                # Configure highlight
-                current_panel.tag_configure("found", background="yellow")
+                if current_panel in self.overviews:
+                    self.show_overview_matches(current_panel)
                 
                 # Move to first match
                 first_match = current_panel.search(search_text, "1.0", tk.END)
@@ -398,17 +2286,278 @@ class SimplyNoteIt:
         # Bind Enter key
         find_entry.bind("<Return>", lambda e: find())
     
+    # Line transforms
+    def run_transform(self, name):
+        """Run a line transform over the selected lines or the whole panel"""
+        panel = self.get_current_panel()
+        if panel in self.elisions:
+            self.update_status("Transforms are not available while long lines are elided")
+            return
+        try:
+            start = panel.index("sel.first linestart")
+            end = panel.index("sel.last")
+            if not end.endswith(".0") or end == start:
+                end = panel.index("sel.last lineend")
+        except tk.TclError:
+            start, end = "1.0", panel.index("end-1c")
+        snapshot = panel.get(start, end)
+        
+        def work():
+            new_text = transforms.apply_transform(name, snapshot)
+            return transforms.line_diff(snapshot, new_text)
+        
+        def done(hunks, error):
+            if error:
+                messagebox.showerror("Error", f"Transform failed: {error}")
+            elif panel not in self.panels or panel.get(start, end) != snapshot:
+                self.update_status("Text changed during transform, nothing applied")
+            else:
+                self.apply_hunks(panel, start, end, hunks)
+                self.update_status(f"Transform applied: {len(hunks)} change(s)")
+        
+        self.update_status("Transforming...")
+        self.run_in_background(work, done)
+    
+    def apply_hunks(self, panel, start, end, hunks):
+        """Patch changed lines in place so tags, marks and scroll position survive"""
+        if not hunks:
+            return
+        base = int(start.split(".")[0])
+        last_line = int(panel.index(end).split(".")[0]) - base
+        if not end.endswith(".0"):
+            last_line += 1
+        
+        changed = []  # (first line, old last line, new line lengths) per hunk, for the overview
+        
+        # Bottom up so earlier line numbers stay valid
+        def patch():
+            for first, last, lines in reversed(hunks):
+                hunk_end = end if last >= last_line else f"{base + last}.0"
+                text = "".join(lines)
+                self.note_undo(panel, len(text) + len(panel.get(f"{base + first}.0", hunk_end)))
+                old_last = int(panel.index(hunk_end).split(".")[0])
+                panel.replace(f"{base + first}.0", hunk_end, text)
+                new_last = int(panel.index(f"{base + first}.0+{len(text)}c").split(".")[0])
+                if panel in self.overviews:
+                    new_text = panel.get(f"{base + first}.0", f"{new_last}.0 lineend")
+                    changed.append((base + first, old_last, [len(line) for line in new_text.split("\n")]))
+        
+        self.single_undo_step(panel, patch)
+        self.text_changed = True
+        self.update_title()
+        
+        if panel in self.overviews:
+            index = self.overviews[panel]["index"]
+            for first, old_last, lengths in changed:
+                index.replace_lines(first - 1, old_last - first + 1, lengths)
+            self.redraw_overview(panel)
+    
+    def single_undo_step(self, panel, action):
+        """Run action so that all of its edits undo together"""
+        self.forget_fold_edits(panel)
+        panel.config(autoseparators=False)
+        panel.edit_separator()
+        try:
+            action()
+        finally:
+            panel.edit_separator()
+            panel.config(autoseparators=True)
+    
+    # Multi-cursor
+    def set_cursors(self, panel, positions):
+        """Replace the panel's cursors with (line, column) positions"""
+        if not positions:
+            self.clear_multicursor(panel)
+            return
+        base_line = min(line for line, _ in positions)
+        last_line = max(line for line, _ in positions)
+        panel.mark_set("multicursor_base", f"{base_line}.0")
+        panel.mark_gravity("multicursor_base", tk.LEFT)
+        span = panel.get(f"{base_line}.0", f"{last_line}.0 lineend")
+        self.multicursors[panel] = multicursor.CursorSet(multicursor.to_offsets(span, base_line, positions))
+        self.draw_cursors(panel)
+    
+    def cursor_positions(self, panel):
+        """Current cursors as (span, base line, [(line, column), ...])"""
+        cursors = self.multicursors[panel]
+        base_line, base_column = map(int, panel.index("multicursor_base").split("."))
+        if base_column:
+            # Something joined the base line onto the one above; rebase to its start
+            panel.mark_set("multicursor_base", f"{base_line}.0")
+            cursors.shift(base_column)
+        span = panel.get("multicursor_base", f"multicursor_base + {cursors.offsets[-1]} chars lineend")
+        return span, base_line, multicursor.to_positions(span, base_line, cursors.offsets)
+    
+    def draw_cursors(self, panel):
+        """Show every cursor with one tag_add call"""
+        _, _, positions = self.cursor_positions(panel)
+        panel.tag_remove("multicursor", "1.0", tk.END)
+        ranges = []
+        for line, column in positions:
+            ranges.append(f"{line}.{column}")
+            ranges.append(f"{line}.{column}+1c")
+        panel.tag_add("multicursor", *ranges)
+        line, column = positions[-1]
+        panel.mark_set(tk.INSERT, f"{line}.{column}")
+        panel.see(tk.INSERT)
+        self.update_status(f"{len(positions)} cursors")
+    
+    def clear_multicursor(self, panel):
+        """Drop back to the single Tk cursor"""
+        if self.multicursors.pop(panel, None) is not None:
+            panel.tag_remove("multicursor", "1.0", tk.END)
+            panel.mark_unset("multicursor_base", "multicursor_search")
+        self.multicursor_needle.pop(panel, None)
+    
+    def multicursor_key(self, panel, event):
+        """Apply a key press at every cursor; returns True if it was handled"""
+        keysym = event.keysym
+        if keysym == "Escape":
+            self.clear_multicursor(panel)
+            return True
+        if event.state & 0x4 or keysym in ("Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R"):
+            return False
+        if keysym == "BackSpace":
+            self.multicursor_delete(panel, before=True)
+        elif keysym == "Delete":
+            self.multicursor_delete(panel, before=False)
+        elif keysym in ("Left", "Right"):
+            span, _, _ = self.cursor_positions(panel)
+            self.multicursors[panel].move(-1 if keysym == "Left" else 1, len(span))
+            self.draw_cursors(panel)
+        elif keysym == "Return":
+            self.multicursor_insert(panel, "\n")
+        elif keysym == "Tab":
+            self.multicursor_insert(panel, "\t")
+        elif event.char and event.char.isprintable():
+            self.multicursor_insert(panel, event.char)
+        else:
+            self.clear_multicursor(panel)
+            return False
+        return True
+    
+    def multicursor_insert(self, panel, text):
+        """Insert text at every cursor as one transaction"""
+        _, _, positions = self.cursor_positions(panel)
+        # One Tcl script, bottom up so earlier indices stay valid; Tk lays out once afterwards
+        panel.tk.call("set", "::snit_multicursor_text", text)
+        widget = str(panel)
+        script = "\n".join(
+            f"{widget} insert {line}.{column} $::snit_multicursor_text"
+            for line, column in reversed(positions)
+        )
+        self.single_undo_step(panel, lambda: panel.tk.eval(script))
+        self.note_undo(panel, len(text) * len(positions))
+        self.multicursors[panel].after_insert(len(text))
+        self.draw_cursors(panel)
+        self.schedule_overview(panel, [line for line, _ in positions])
+        self.on_text_change()
+    
+    def multicursor_delete(self, panel, before):
+        """Delete one char before (BackSpace) or after (Delete) every cursor"""
+        _, base_line, positions = self.cursor_positions(panel)
+        deleted = [True] * len(positions)
+        if before and positions[0] == (1, 0):
+            deleted[0] = False
+        if not before:
+            line, column = positions[-1]
+            deleted[-1] = panel.compare(f"{line}.{column}", "<", "end-1c")
+        widget = str(panel)
+        commands = []
+        for (line, column), did_delete in zip(reversed(positions), reversed(deleted)):
+            if not did_delete:
+                continue
+            if before:
+                commands.append(f"{widget} delete {{{line}.{column} -1c}} {line}.{column}")
+            else:
+                commands.append(f"{widget} delete {line}.{column}")
+        if commands:
+            self.single_undo_step(panel, lambda: panel.tk.eval("\n".join(commands)))
+            self.note_undo(panel, len(commands))
+        self.multicursors[panel].after_delete(before, deleted)
+        if before and deleted[0] and positions[0] == (base_line, 0):
+            # That took the newline just before the base mark, so the mark moved back a char too
+            self.multicursors[panel].shift(1)
+        self.draw_cursors(panel)
+        self.schedule_overview(panel, [line for line, _ in positions])
+        self.on_text_change()
+    
+    def add_cursor_at_next_match(self):
+        """Add a cursor after the next occurrence of the selection or current word"""
+        panel = self.get_current_panel()
+        try:
+            needle = panel.get(tk.SEL_FIRST, tk.SEL_LAST)
+            anchor = panel.index(tk.SEL_LAST)
+        except tk.TclError:
+            anchor = panel.index("insert wordend")
+            needle = panel.get("insert wordstart", anchor)
+        if panel in self.multicursors:
+            needle = self.multicursor_needle.get(panel, needle)
+            _, _, positions = self.cursor_positions(panel)
+            if "multicursor_search" in panel.mark_names():
+                anchor = panel.index("multicursor_search")
+        else:
+            positions = [tuple(map(int, anchor.split(".")))]
+        if not needle.strip() or "\n" in needle:
+            return
+        
+        found = panel.search(needle, anchor, forwards=True, exact=True)
+        if found:
+            end = panel.index(f"{found}+{len(needle)}c")
+            positions.append(tuple(map(int, end.split("."))))
+            panel.mark_set("multicursor_search", end)
+        else:
+            panel.mark_set("multicursor_search", anchor)
+        panel.tag_remove(tk.SEL, "1.0", tk.END)
+        self.multicursor_needle[panel] = needle
+        self.set_cursors(panel, sorted(set(positions)))
+    
+    def cursor_per_line(self):
+        """Put a cursor at the end of every selected line"""
+        panel = self.get_current_panel()
+        try:
+            first = int(panel.index(tk.SEL_FIRST).split(".")[0])
+            last_line, last_column = map(int, panel.index(tk.SEL_LAST).split("."))
+        except tk.TclError:
+            return
+        if last_column == 0 and last_line > first:
+            last_line -= 1
+        panel.tag_remove(tk.SEL, "1.0", tk.END)
+        # Columns past the end of a line are clamped to it
+        self.set_cursors(panel, [(line, sys.maxsize) for line in range(first, last_line + 1)])
+    
+    def column_select_start(self, event):
+        """Start an Alt+drag column selection"""
+        self.column_anchor = event.widget.index(f"@{event.x},{event.y}")
+        return "break"
+    
+    def column_select_drag(self, event):
+        """Put a cursor on every line between the anchor and the pointer"""
+        panel = event.widget
+        anchor_line = int(self.column_anchor.split(".")[0])
+        line, column = map(int, panel.index(f"@{event.x},{event.y}").split("."))
+        first, last = sorted((anchor_line, line))
+        self.set_cursors(panel, [(number, column) for number in range(first, last + 1)])
+        return "break"
+    
     def change_font_size(self, event=None):
         """Change font size"""
         try:
             size = int(self.font_size.get())
-            current_font = self.text_area.cget("font")
-            font_family = current_font.split()[0] if current_font else "Consolas"
-            # Apply to all panels
-            for panel in self.panels:
-                panel.config(font=(font_family, size))
         except ValueError:
-            pass
+            return
+        # Every panel uses the same named font, so this is one change for Tk
+        self.editor_font.configure(size=size)
+    
+    def change_theme(self):
+        """Switch every panel to the selected theme in one pass"""
+        self.theme_options, self.theme_tags = themes.compile_theme(self.theme_name.get())
+        for panel in self.panels:
+            panel.configure(**self.theme_options)
+            for tag, options in self.theme_tags.items():
+                panel.tag_configure(tag, **options)
+            self.redraw_overview(panel)
+        self.update_status(f"Theme: {self.theme_name.get()}")
     
     def split_horizontal(self):
         """Split the current panel horizontally"""
@@ -417,24 +2566,7 @@ class SimplyNoteIt:
             return
         
         # Create new text widget
-        new_text = scrolledtext.ScrolledText(
-            self.text_frame,
-            wrap=tk.WORD,
-            font=("Consolas", 12),
-            undo=True,
-            maxundo=50
-        )
-        
-        # Configure new text widget
-        new_text.config(
-            tabs=("2c", "4c", "6c", "8c"),
-            insertbackground="black",
-            selectbackground="lightblue"
-        )
-        
-        # Bind events to new panel
-        new_text.bind("<KeyPress>", self.on_text_change)
-        new_text.bind("<Button-1>", self.on_text_change)
+        new_text = self.create_panel()
         
         # Add to panels list
         self.panels.append(new_text)
@@ -442,8 +2574,8 @@ class SimplyNoteIt:
         # Reorganize layout
         self.reorganize_panels()
         
-        # Focus the new panel
-        self.current_panel = len(self.panels) - 1
+        # Focus the new panel; it starts out as an untitled file of its own
+        self.set_current_panel(len(self.panels) - 1)
         new_text.focus_set()
         
         self.split_mode = True
@@ -457,24 +2589,7 @@ class SimplyNoteIt:
             return
         
         # Create new text widget
-        new_text = scrolledtext.ScrolledText(
-            self.text_frame,
-            wrap=tk.WORD,
-            font=("Consolas", 12),
-            undo=True,
-            maxundo=50
-        )
-        
-        # Configure new text widget
-        new_text.config(
-            tabs=("2c", "4c", "6c", "8c"),
-            insertbackground="black",
-            selectbackground="lightblue"
-        )
-        
-        # Bind events to new panel
-        new_text.bind("<KeyPress>", self.on_text_change)
-        new_text.bind("<Button-1>", self.on_text_change)
+        new_text = self.create_panel()
         
         # Add to panels list
         self.panels.append(new_text)
@@ -482,8 +2597,8 @@ class SimplyNoteIt:
         # Reorganize layout
         self.reorganize_panels()
         
-        # Focus the new panel
-        self.current_panel = len(self.panels) - 1
+        # Focus the new panel; it starts out as an untitled file of its own
+        self.set_current_panel(len(self.panels) - 1)
         new_text.focus_set()
         
         self.split_mode = True
@@ -500,11 +2615,13 @@ class SimplyNoteIt:
         if self.current_panel > 0:
             panel_to_remove = self.panels[self.current_panel]
             self.panels.remove(panel_to_remove)
+            self.forget_panel(panel_to_remove)
             panel_to_remove.destroy()
             
-            # Adjust current panel index
+            # Adjust current panel index; the panel now there brings its own file
             if self.current_panel >= len(self.panels):
                 self.current_panel = len(self.panels) - 1
+            self.current_file, self.text_changed = self.panel_files.pop(self.get_current_panel(), (None, False))
         
         # Reorganize layout
         self.reorganize_panels()
@@ -518,6 +2635,22 @@ class SimplyNoteIt:
         self.update_title()
         self.update_status("Split closed")
     
+    def forget_panel(self, panel):
+        """Drop everything kept per panel, so a closed panel's widget and data can be freed"""
+        self.stop_stream(panel)
+        self.detach_overview(panel)
+        self.close_hex(panel)
+        for jobs in (self.diagnostic_jobs, self.diagnostic_tag_jobs):
+            job = jobs.pop(panel, None)
+            if job:
+                self.root.after_cancel(job)
+        for per_panel in (self.elisions, self.multicursors, self.multicursor_needle, self.undo_chars,
+                          self.focus_times, self.unloaded, self.fold_indexes, self.fold_edits, self.outline_symbols,
+                          self.diagnostics, self.edit_generations, self.panel_files):
+            per_panel.pop(panel, None)
+        self.pasting.discard(panel)
+        self.unloading.discard(panel)
+    
     def reorganize_panels(self):
         """Reorganize the layout of panels"""
         # Clear the text frame
@@ -555,8 +2688,14 @@ class SimplyNoteIt:
 
 def main():
     """Main function"""
+    args = sys.argv[1:]
     root = tk.Tk()
     app = SimplyNoteIt(root)
+    if "--new-instance" not in args and app.instance_server.start():
+        app.poll_instance_requests()
+    paths = [arg for arg in args if not arg.startswith("--")]
+    if paths:
+        app.open_paths(paths)
     root.mainloop()
 
 if __name__ == "__main__":
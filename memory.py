@@ -0,0 +1,77 @@
+"""
+Simply Note It - Memory accounting
+Rough estimates of what each panel costs, and the compressed form that
+idle panels are unloaded to
+"""
+
+import os
+import zlib
+
+# Rough costs inside Tk's text widget, in bytes
+LINE_COST = 96        # B-tree line record and segment header
+TAG_RANGE_COST = 80   # Two toggle segments
+MARK_COST = 64
+UNDO_CHAR_COST = 4    # Undo records keep the text plus index strings
+
+# Panels that have not had focus for this long, are unmodified and cost at
+# least this much are unloaded; the check runs on this interval
+IDLE_SECONDS = 10 * 60
+UNLOAD_MIN_BYTES = 1024 * 1024
+CHECK_INTERVAL_MS = 60 * 1000
+
+# Fast level: unloading must not stall, and text still shrinks several times
+COMPRESS_LEVEL = 1
+
+
+def estimate(usage):
+    """Estimated bytes for a usage dict (chars, lines, tag_ranges, marks, undo_chars, extra)"""
+    return (
+        usage["chars"]
+        + usage["lines"] * LINE_COST
+        + usage["tag_ranges"] * TAG_RANGE_COST
+        + usage["marks"] * MARK_COST
+        + usage["undo_chars"] * UNDO_CHAR_COST
+        + usage["extra"]
+    )
+
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024 or unit == "G":
+            break
+        size /= 1024
+    if unit == "B":
+        return f"{size} B"
+    return f"{size:.1f}{unit}"
+
+
+def resident_bytes():
+    """Resident set size of this process, or None where it cannot be read"""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current, in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class Unloaded:
+    """A panel's text as zlib-compressed UTF-8, with where the view was"""
+
+    def __init__(self, text, protected, insert, view):
+        data = text.encode("utf-8")
+        self.size = len(data)
+        self.data = zlib.compress(data, COMPRESS_LEVEL)
+        self.protected = protected  # Had long lines elided
+        self.insert = insert
+        self.view = view
+
+    def text(self):
+        return zlib.decompress(self.data).decode("utf-8")
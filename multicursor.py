@@ -0,0 +1,86 @@
+"""
+Simply Note It - Multi-cursor
+Cursors are kept as a sorted array of character offsets from a base point and
+shifted in bulk after each edit
+"""
+
+from array import array
+from bisect import bisect_left
+
+
+class CursorSet:
+    def __init__(self, offsets=()):
+        self.offsets = array("q", sorted(set(offsets)))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def add(self, offset):
+        """Add a cursor, ignoring duplicates"""
+        i = bisect_left(self.offsets, offset)
+        if i == len(self.offsets) or self.offsets[i] != offset:
+            self.offsets.insert(i, offset)
+
+    def shift(self, delta):
+        """Move every cursor by delta"""
+        self.offsets = array("q", (offset + delta for offset in self.offsets))
+
+    def after_insert(self, length):
+        """Positions after length chars were inserted at every cursor"""
+        self.offsets = array("q", (offset + length * (i + 1) for i, offset in enumerate(self.offsets)))
+
+    def after_delete(self, before, deleted):
+        """
+        Positions after deleting one char at every cursor.
+
+        deleted[i] says whether cursor i actually removed a char; before is
+        True for BackSpace and False for Delete. Cursors that meet are merged.
+        """
+        result = array("q")
+        removed = 0
+        for offset, did_delete in zip(self.offsets, deleted):
+            if did_delete:
+                removed += 1
+            position = offset - removed if before else offset - removed + did_delete
+            if not result or result[-1] != position:
+                result.append(position)
+        self.offsets = result
+
+    def move(self, delta, limit):
+        """Move every cursor left or right, clamped to [0, limit]"""
+        self.offsets = array("q", sorted(set(min(max(offset + delta, 0), limit) for offset in self.offsets)))
+
+
+def newline_positions(span):
+    """Offsets of every newline in span"""
+    positions = []
+    find = span.find
+    i = find("\n")
+    while i != -1:
+        positions.append(i)
+        i = find("\n", i + 1)
+    return positions
+
+
+def to_positions(span, base_line, offsets):
+    """Convert offsets into span to (line, column) pairs"""
+    newlines = newline_positions(span)
+    positions = []
+    for offset in offsets:
+        line = bisect_left(newlines, offset)
+        column = offset - (newlines[line - 1] + 1 if line else 0)
+        positions.append((base_line + line, column))
+    return positions
+
+
+def to_offsets(span, base_line, positions):
+    """Convert (line, column) pairs to offsets into span"""
+    line_starts = [0] + [i + 1 for i in newline_positions(span)]
+    offsets = []
+    for line, column in positions:
+        index = line - base_line
+        start = line_starts[index]
+        end = line_starts[index + 1] - 1 if index + 1 < len(line_starts) else len(span)
+        offsets.append(min(start + column, end))
+    return offsets
+
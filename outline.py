@@ -0,0 +1,134 @@
+"""
+Simply Note It - Python outline
+Lists classes, functions and methods. The source is cut into top-level
+blocks and parse results are cached per block, so after an edit only the
+blocks whose text changed are parsed again. outline_document is meant to
+run in a worker process, where the cache lives.
+"""
+
+import ast
+import re
+from collections import OrderedDict
+
+# Documents whose block cache is kept in the worker
+MAX_DOCUMENTS = 8
+
+_interesting = re.compile(r"""\"\"\"|'''|["'#()\[\]{}]""")
+
+# Unindented lines that carry on the statement above rather than start a new one
+_continuation = re.compile(r"(else|elif|except|finally)\b")
+
+
+def _line_state(line, depth, quote):
+    """Bracket depth and open triple quote after a line, roughly"""
+    position = 0
+    while True:
+        match = _interesting.search(line, position)
+        if match is None:
+            return depth, quote
+        token = match.group()
+        position = match.end()
+        if quote:
+            if token == quote:
+                quote = None
+        elif token == "#":
+            return depth, quote
+        elif len(token) == 3:
+            quote = token
+        elif token in "\"'":
+            end = line.find(token, position)
+            if end == -1:
+                return depth, quote
+            position = end + 1
+        elif token in "([{":
+            depth += 1
+        else:
+            depth = max(depth - 1, 0)
+
+
+def split_blocks(source):
+    """Cut source into top-level blocks as (first line, text) pairs"""
+    blocks = []
+    lines = source.split("\n")
+    start = 0
+    in_decorator = False
+    depth, quote = 0, None
+    for number, line in enumerate(lines):
+        starts_block = depth == 0 and quote is None and line[:1] not in ("", " ", "\t", "#", ")", "]", "}") \
+            and not _continuation.match(line)
+        if starts_block and number > start and not in_decorator:
+            blocks.append((start + 1, "\n".join(lines[start:number])))
+            start = number
+        if starts_block:
+            in_decorator = line.startswith("@")
+        depth, quote = _line_state(line, depth, quote)
+    blocks.append((start + 1, "\n".join(lines[start:])))
+    return blocks
+
+
+def _symbols(body, depth, prefix):
+    symbols = []
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            kind = "class"
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind = "method" if prefix and depth else "function"
+        else:
+            # Definitions under if/try/with/for/while belong to the enclosing scope
+            for field in ("body", "orelse", "finalbody"):
+                symbols.extend(_symbols(getattr(node, field, None) or (), depth, prefix))
+            for handler in getattr(node, "handlers", None) or ():
+                symbols.extend(_symbols(handler.body, depth, prefix))
+            continue
+        name = f"{prefix}{node.name}"
+        symbols.append((kind, name, node.lineno, depth))
+        if kind == "class":
+            symbols.extend(_symbols(node.body, depth + 1, f"{name}."))
+    return symbols
+
+
+def parse_block(text):
+    """Symbols in one block as (kind, name, line, depth), or None if it does not parse"""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+    return _symbols(tree.body, 0, "")
+
+
+class OutlineIndex:
+    """Symbols of one document, cached per block text"""
+
+    def __init__(self):
+        self.cache = {}
+
+    def update(self, source):
+        """Symbols for new source as (kind, name, line, depth); unparseable blocks are skipped"""
+        blocks = split_blocks(source)
+        cache = {}
+        symbols = []
+        for first_line, text in blocks:
+            if text in cache:
+                block_symbols = cache[text]
+            elif text in self.cache:
+                block_symbols = self.cache[text]
+            else:
+                block_symbols = parse_block(text)
+            cache[text] = block_symbols
+            for kind, name, line, depth in block_symbols or ():
+                symbols.append((kind, name, first_line + line - 1, depth))
+        # Only keep blocks that still exist
+        self.cache = cache
+        return symbols
+
+
+_documents = OrderedDict()
+
+
+def outline_document(document, source):
+    """Outline source, reusing this process's cache for the document key"""
+    index = _documents.pop(document, None) or OutlineIndex()
+    _documents[document] = index
+    while len(_documents) > MAX_DOCUMENTS:
+        _documents.popitem(last=False)
+    return index.update(source)
@@ -0,0 +1,115 @@
+"""
+Simply Note It - Overview ruler data
+Per-line lengths, find hits and edited lines, kept in compact arrays and
+aggregated into buckets so a redraw never needs the document text
+"""
+
+from array import array
+
+# Buckets are power-of-two line ranges, at most this many of them
+MAX_BUCKETS = 2048
+
+# Line length that fills the full ruler width
+FULL_WIDTH_CHARS = 120
+
+
+class DensityIndex:
+    def __init__(self):
+        self.lengths = array("I")
+        self.matches = array("I")
+        self.edited = array("B")
+        self.bucket_lines = 1
+        self.bucket_length = array("I")
+        self.bucket_matches = array("I")
+        self.bucket_edited = array("B")
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def load(self, text):
+        """Measure every line of text; clears matches and edit marks"""
+        self.lengths = array("I", map(len, text.split("\n")))
+        self.matches = array("I", bytes(4 * len(self.lengths)))
+        self.edited = array("B", bytes(len(self.lengths)))
+        self._rebucket(0)
+
+    def replace_lines(self, first, count, new_lengths):
+        """Replace count lines from index first with lines of new_lengths; they are marked edited"""
+        end = first + count
+        added = len(new_lengths)
+        self.lengths[first:end] = array("I", new_lengths)
+        self.matches[first:end] = array("I", bytes(4 * added))
+        self.edited[first:end] = array("B", b"\x01" * added)
+        if added == count:
+            # Same shape: only the touched buckets change
+            self._rebucket(first // self.bucket_lines, (first + added) // self.bucket_lines + 1)
+        else:
+            self._rebucket(first // self.bucket_lines)
+
+    def update_lengths(self, lines, lengths):
+        """New lengths for existing lines (0-based); they are marked edited"""
+        touched = set()
+        for line, length in zip(lines, lengths):
+            if 0 <= line < len(self.lengths):
+                self.lengths[line] = length
+                self.edited[line] = 1
+                touched.add(line // self.bucket_lines)
+        for bucket in touched:
+            self._rebucket(bucket, bucket + 1)
+
+    def set_matches(self, lines):
+        """Set find hits from a list of 0-based line indexes"""
+        self.matches = array("I", bytes(4 * len(self.lengths)))
+        for line in lines:
+            if 0 <= line < len(self.matches):
+                self.matches[line] += 1
+        self._rebucket(0)
+
+    def clear_edited(self):
+        """Forget edit marks, e.g. after a save"""
+        self.edited = array("B", bytes(len(self.lengths)))
+        self._rebucket(0)
+
+    def _rebucket(self, start, stop=None):
+        lines = len(self.lengths)
+        bucket_lines = 1
+        while lines > bucket_lines * MAX_BUCKETS:
+            bucket_lines *= 2
+        if bucket_lines != self.bucket_lines:
+            self.bucket_lines = bucket_lines
+            start, stop = 0, None
+        buckets = -(-lines // bucket_lines)
+        for name in ("bucket_length", "bucket_matches", "bucket_edited"):
+            values = getattr(self, name)
+            del values[buckets:]
+            values.extend([0] * (buckets - len(values)))
+        stop = buckets if stop is None else min(stop, buckets)
+        for bucket in range(start, stop):
+            low = bucket * bucket_lines
+            high = low + bucket_lines
+            self.bucket_length[bucket] = max(self.lengths[low:high], default=0)
+            self.bucket_matches[bucket] = sum(self.matches[low:high])
+            self.bucket_edited[bucket] = max(self.edited[low:high], default=0)
+
+    def rows(self, height):
+        """
+        Aggregate buckets into at most height rows.
+
+        Yields (top, bottom, width fraction, matches, edited) with top and
+        bottom in pixels.
+        """
+        buckets = len(self.bucket_length)
+        if not buckets or height <= 0:
+            return
+        cells = min(buckets, height)
+        for cell in range(cells):
+            low = cell * buckets // cells
+            high = max((cell + 1) * buckets // cells, low + 1)
+            length = max(self.bucket_length[low:high])
+            yield (
+                cell * height / cells,
+                (cell + 1) * height / cells,
+                min(length, FULL_WIDTH_CHARS) / FULL_WIDTH_CHARS,
+                sum(self.bucket_matches[low:high]),
+                max(self.bucket_edited[low:high]),
+            )
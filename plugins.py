@@ -0,0 +1,221 @@
+"""
+Simply Note It - Plugins
+Plugins are found at startup but only imported when one of their hooks or
+commands is first needed.
+
+A plugin is a .py file in one of PLUGIN_DIRS. What it provides is declared in
+comment lines at the top of the file, so nothing has to be imported to know
+when to load it:
+
+    # hooks: on_save, on_buffer_change
+    # worker-hooks: on_save
+    # commands: Word Count=word_count
+
+Hooks are module functions named after the hook and called with a context
+dict ("path", "text", "panel"). Hooks listed under worker-hooks run in a
+worker thread and must not touch Tk. A hook may return a string, which is
+shown in the status bar. Commands get the same context and always run in a
+worker thread.
+"""
+
+import importlib.util
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PLUGIN_DIRS = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins"),
+    os.path.join(os.path.expanduser("~"), ".simply-note-it", "plugins"),
+]
+
+HOOKS = ("on_open", "on_save", "on_buffer_change")
+
+# Hooks run on the UI thread that take longer than this get a strike;
+# a plugin is disabled after MAX_STRIKES
+UI_TIME_BUDGET = 0.02
+MAX_STRIKES = 3
+
+MANIFEST_LINES = 20
+
+
+class Plugin:
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.module = None
+        self.manifest = None
+        self.enabled = True
+        self.error = None
+        self.strikes = 0
+        self.timings = {}  # hook or command -> [calls, total seconds, worst]
+
+    def read_manifest(self):
+        """Read the declared hooks and commands from the header comments"""
+        manifest = {"hooks": set(), "worker-hooks": set(), "commands": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for _ in range(MANIFEST_LINES):
+                    line = file.readline()
+                    if not line.startswith("#"):
+                        continue
+                    key, _, value = line[1:].partition(":")
+                    key = key.strip()
+                    items = [item.strip() for item in value.split(",") if item.strip()]
+                    if key == "commands":
+                        for item in items:
+                            label, _, function = item.partition("=")
+                            manifest["commands"][label.strip()] = function.strip()
+                    elif key in ("hooks", "worker-hooks"):
+                        manifest[key].update(item for item in items if item in HOOKS)
+        except OSError as e:
+            self.disable(e)
+        self.manifest = manifest
+        return manifest
+
+    def load(self):
+        """Import the plugin module on first use"""
+        if self.module is None and self.enabled:
+            try:
+                spec = importlib.util.spec_from_file_location(f"snit_plugin_{self.name}", self.path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                self.module = module
+            except Exception as e:
+                self.disable(e)
+        return self.module
+
+    def disable(self, error=None):
+        """Stop calling this plugin"""
+        self.enabled = False
+        if error is not None:
+            self.error = error
+
+    def call(self, function_name, key, context):
+        """Call a plugin function and record how long it took"""
+        module = self.load()
+        function = getattr(module, function_name, None) if module else None
+        if function is None:
+            return None, 0.0
+        start = time.perf_counter()
+        try:
+            result = function(context)
+        except Exception as e:
+            self.disable(e)
+            result = None
+        elapsed = time.perf_counter() - start
+        stats = self.timings.setdefault(key, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        return result, elapsed
+
+
+class PluginManager:
+    def __init__(self, plugin_dirs=None):
+        self.plugins = self.discover(plugin_dirs or PLUGIN_DIRS)
+        self.executor = None
+        self.results = queue.Queue()
+        self.pending = 0
+        self.subscribed = set()  # Hooks that at least one plugin declares
+
+    def discover(self, plugin_dirs):
+        """List plugin files without reading or importing them"""
+        plugins = []
+        for directory in plugin_dirs:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".py") and not entry.name.startswith("_"):
+                    plugins.append(Plugin(entry.name[:-3], entry.path))
+        return plugins
+
+    def read_manifests(self):
+        """Read every plugin header; safe to run in a background thread"""
+        subscribed = set()
+        for plugin in self.plugins:
+            manifest = plugin.read_manifest()
+            subscribed |= manifest["hooks"] | manifest["worker-hooks"]
+        self.subscribed = subscribed
+
+    def has_subscribers(self, hook):
+        """Whether any plugin wants this hook, without importing anything"""
+        return hook in self.subscribed
+
+    def run_hook(self, hook, context):
+        """
+        Dispatch a hook.
+
+        Worker hooks are queued on the thread pool. UI hooks run now and are
+        timed against UI_TIME_BUDGET. Returns the messages and slow-plugin
+        warnings produced on the UI thread.
+        """
+        messages = []
+        for plugin in self.plugins:
+            manifest = plugin.manifest
+            if not plugin.enabled or manifest is None:
+                continue
+            if hook in manifest["worker-hooks"]:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="plugin")
+                self.pending += 1
+                future = self.executor.submit(plugin.call, hook, hook, context)
+                future.add_done_callback(lambda f: self.results.put(f.result()[0]))
+            elif hook in manifest["hooks"]:
+                result, elapsed = plugin.call(hook, hook, context)
+                if isinstance(result, str):
+                    messages.append(result)
+                if elapsed > UI_TIME_BUDGET:
+                    plugin.strikes += 1
+                    if plugin.strikes >= MAX_STRIKES:
+                        plugin.disable(f"{hook} kept exceeding {UI_TIME_BUDGET * 1000:.0f}ms")
+                        messages.append(f"Plugin {plugin.name} disabled: too slow")
+                    else:
+                        messages.append(f"Plugin {plugin.name} is slow: {hook} took {elapsed * 1000:.0f}ms")
+        return messages
+
+    def poll_results(self):
+        """Collect messages from finished worker hooks"""
+        messages = []
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if isinstance(result, str):
+                messages.append(result)
+        return messages
+
+    def commands(self):
+        """All declared commands as (plugin, label) pairs"""
+        return [
+            (plugin, label)
+            for plugin in self.plugins
+            if plugin.enabled and plugin.manifest
+            for label in plugin.manifest["commands"]
+        ]
+
+    def run_command(self, plugin, label, context):
+        """Run a plugin command; meant for a worker thread, so it must not touch Tk"""
+        result, _ = plugin.call(plugin.manifest["commands"][label], label, context)
+        return result
+
+    def report(self):
+        """Timing summary, one line per plugin hook or command"""
+        lines = []
+        for plugin in self.plugins:
+            state = "enabled" if plugin.enabled else f"disabled ({plugin.error})"
+            loaded = "loaded" if plugin.module else "not loaded"
+            lines.append(f"{plugin.name}: {state}, {loaded}")
+            for key, (calls, total, worst) in sorted(plugin.timings.items()):
+                average = total / calls * 1000
+                lines.append(f"  {key}: {calls} calls, avg {average:.1f}ms, worst {worst * 1000:.1f}ms")
+        return "\n".join(lines) or "No plugins found"
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
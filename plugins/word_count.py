@@ -0,0 +1,11 @@
+# commands: Word Count=word_count
+"""
+Simply Note It - Example plugin
+Counts words in the current panel
+"""
+
+
+def word_count(context):
+    """Report words and characters in the panel"""
+    text = context["text"]
+    return f"{len(text.split())} words, {len(text)} characters"
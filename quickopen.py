@@ -0,0 +1,216 @@
+"""
+Simply Note It - Quick open
+A cached index of the files under a project directory. Refreshing stats
+every directory but only lists the ones whose mtime changed. Searching
+gathers candidates with regex scans from the likeliest kind of match to
+the loosest (the query as written, then anywhere as a subsequence),
+basenames before whole paths, and stops once it has enough or its time
+is up; only those are fuzzy scored.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import time
+
+import fuzzy
+
+IGNORED_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", ".tox", ".mypy_cache", ".cache"}
+
+# Stop indexing past this many files
+MAX_FILES = 500000
+
+# At most this many prefiltered candidates are fuzzy scored
+SCORE_LIMIT = 2000
+
+# Searching runs on the UI thread per key; scans stop at this deadline and
+# check it after every window of about this many characters
+SEARCH_BUDGET = 0.04
+SCAN_WINDOW = 256 * 1024
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                         "simply-note-it", "quickopen")
+
+
+def project_root(path):
+    """Nearest directory above path holding a VCS directory, else path's own directory"""
+    start = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    directory = start
+    while True:
+        if any(os.path.isdir(os.path.join(directory, name)) for name in (".git", ".hg", ".svn")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return start
+        directory = parent
+
+
+def cache_path(root):
+    """Where the index for root is kept"""
+    name = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, name + ".json")
+
+
+class FileIndex:
+    """File paths under root, relative to it"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.dirs = {}  # relative dir -> [mtime_ns, file names, subdir names]
+        # (paths, lowered paths blob, line starts, lowered basenames blob, line starts),
+        # swapped in one assignment so a search never sees half of a refresh
+        self.snapshot = ([], "", [0], "", [0])
+        self.last_search = (None, None, None)  # (snapshot, query, every match if the scan finished)
+
+    def __len__(self):
+        return len(self.snapshot[0])
+
+    def load(self):
+        """Read the cached index; returns False if there is none"""
+        try:
+            with open(cache_path(self.root), "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if data.get("root") != self.root:
+            return False
+        self.dirs = data["dirs"]
+        self._publish()
+        return True
+
+    def save(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp = cache_path(self.root) + ".tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump({"root": self.root, "dirs": self.dirs}, file, separators=(",", ":"))
+        os.replace(temp, cache_path(self.root))
+
+    def refresh(self):
+        """Bring the index up to date; returns how many directories had to be listed"""
+        old = self.dirs
+        dirs = {}
+        listed = 0
+        files = 0
+        pending = [""]
+        while pending and files < MAX_FILES:
+            relative = pending.pop()
+            path = os.path.join(self.root, relative) if relative else self.root
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(relative)
+            if entry is None or entry[0] != mtime:
+                # Adding or removing an entry bumps the directory's mtime
+                entry = self._list(path, mtime)
+                listed += 1
+            dirs[relative] = entry
+            files += len(entry[1])
+            # Subdirectories are still visited: their changes do not reach this mtime
+            pending.extend(os.path.join(relative, name) if relative else name for name in entry[2])
+        self.dirs = dirs
+        self._publish()
+        return listed
+
+    def _list(self, path, mtime):
+        names, subdirs = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRS:
+                                subdirs.append(entry.name)
+                        else:
+                            names.append(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return [mtime, names, subdirs]
+
+    def _publish(self):
+        paths = []
+        for relative, (_, names, _) in self.dirs.items():
+            if relative:
+                prefix = relative + os.sep
+                paths.extend(prefix + name for name in names)
+            else:
+                paths.extend(names)
+        # Shortest first: an early stop in search keeps the likeliest matches
+        paths.sort(key=len)
+        lowered = "\n".join(paths).lower()
+        basenames = "\n".join(os.path.basename(path) for path in paths).lower()
+        self.snapshot = (paths, lowered, _line_starts(lowered), basenames, _line_starts(basenames))
+
+    def search(self, query, limit=50):
+        """Best matching relative paths for query"""
+        snapshot = self.snapshot
+        paths, lowered, path_starts, basenames, name_starts = snapshot
+        query = query.replace(" ", "").lower()
+        if not query:
+            return paths[:limit]
+        pattern = _subsequence(query)
+        last_snapshot, last_query, last_matches = self.last_search
+        if last_snapshot is snapshot and last_matches is not None and query.startswith(last_query):
+            # Typing on only narrows a finished search
+            matches = [line for line in last_matches
+                       if pattern.search(lowered, path_starts[line], _line_end(lowered, path_starts, line))]
+            finished = True
+        else:
+            deadline = time.monotonic() + SEARCH_BUDGET
+            seen = set()
+            matches = []
+            finished = True
+            # Looser patterns only fill what the tighter ones left, so a close match is never cut
+            for tier in (re.compile(re.escape(query)), pattern):
+                for blob, starts in ((basenames, name_starts), (lowered, path_starts)):
+                    found, complete = _scan(blob, starts, tier, SCORE_LIMIT - len(matches), seen, deadline)
+                    matches.extend(found)
+                    finished = finished and complete
+        self.last_search = (snapshot, query, matches if finished else None)
+        return fuzzy.rank(query, [paths[line] for line in matches], limit)
+
+
+def _line_starts(blob):
+    return [0] + [match.end() for match in re.finditer("\n", blob)]
+
+
+def _line_end(blob, starts, line):
+    return starts[line + 1] - 1 if line + 1 < len(starts) else len(blob)
+
+
+def _subsequence(query):
+    """Regex for query as a subsequence within one line; the negated classes never backtrack far"""
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        char = re.escape(char)
+        parts.append(f"[^{char}\n]*{char}")
+    return re.compile("".join(parts))
+
+
+def _scan(blob, starts, pattern, want, seen, deadline):
+    """
+    Line numbers of the first want lines pattern matches, skipping those in
+    seen, and whether that was every match: False if want ran out or the
+    deadline passed first
+    """
+    found = []
+    position = 0
+    while position < len(blob):
+        if len(found) >= want or time.monotonic() > deadline:
+            return found, False
+        # Windows end on a line break, which no pattern crosses
+        end = blob.find("\n", position + SCAN_WINDOW)
+        end = len(blob) if end == -1 else end
+        for match in pattern.finditer(blob, position, end):
+            line = bisect.bisect_right(starts, match.start()) - 1
+            if line not in seen:
+                seen.add(line)
+                found.append(line)
+                if len(found) >= want:
+                    return found, False
+        position = end + 1
+    return found, True
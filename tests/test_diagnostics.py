@@ -0,0 +1,52 @@
+"""
+Simply Note It - Diagnostics tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import diagnostics
+
+
+def messages(source):
+    return [diagnostic[-1] for diagnostic in diagnostics.check(source)]
+
+
+class LinterTests(unittest.TestCase):
+
+    def test_fstring_without_placeholders(self):
+        self.assertEqual(messages('x = f"plain"\n'), ["f-string without any placeholders"])
+
+    def test_fstring_format_spec_is_not_reported(self):
+        self.assertEqual(messages('width = 3\nx = f"{width:>10}"\ny = f"{width:{width}d}"\n'), [])
+
+    def test_name_in_format_spec_counts_as_used(self):
+        self.assertEqual(messages('from os import sep\nx = f"{1:{sep}}"\n'), [])
+
+    def test_unused_import(self):
+        self.assertEqual(messages("import os\n"), ["'os' imported but unused"])
+
+    def test_future_import_is_not_unused(self):
+        self.assertEqual(messages("from __future__ import annotations\n"), [])
+
+    def test_comparison_to_none(self):
+        self.assertEqual(messages("x = 1\ny = x == None\n"), ["comparison to None should use 'is' or 'is not'"])
+
+    def test_bare_except(self):
+        found = diagnostics.check("try:\n    pass\nexcept:\n    pass\n")
+        self.assertEqual([(line, column, end) for _, line, column, _, end, _ in found], [(3, 0, 6)])
+
+    def test_redefinition(self):
+        self.assertEqual(messages("def f():\n    pass\ndef f():\n    pass\n"), ["redefinition of 'f' from line 1"])
+
+    def test_syntax_error(self):
+        found = diagnostics.check("def f(:\n")
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0][0], diagnostics.ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Simply Note It - File I/O tests
+"""
+
+import gzip
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fileio
+
+
+class HeldFS(fileio.LocalFS):
+    """Holds the flush of the destination until released"""
+
+    def __init__(self):
+        self.flushing = threading.Event()
+        self.release = threading.Event()
+
+    def replace(self, source, destination):
+        self.flushing.set()
+        self.release.wait(5)
+        super().replace(source, destination)
+
+
+class WriteBehindTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.staging = os.path.join(self.directory, "staging")
+        self.path = os.path.join(self.directory, "note.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self, path=None):
+        with open(path or self.path, "rb") as file:
+            return file.read()
+
+    def test_save_is_flushed_and_unstaged(self):
+        writer = fileio.WriteBehind(staging_dir=self.staging)
+        writer.save(self.path, b"hello")
+        self.assertTrue(writer.wait(5))
+        self.assertEqual(self.read(), b"hello")
+        self.assertEqual(os.listdir(self.staging), [])
+        self.assertEqual(writer.take_errors(), {})
+
+    def test_saves_during_a_flush_keep_the_last(self):
+        writer = fileio.WriteBehind(fs=fileio.SlowFS(latency=0.002), staging_dir=self.staging)
+        for number in range(200):
+            writer.save(self.path, b"version %d" % number)
+        self.assertTrue(writer.wait(10))
+        self.assertEqual(writer.take_errors(), {})
+        self.assertEqual(self.read(), b"version 199")
+        self.assertEqual(os.listdir(self.staging), [])
+
+    def test_save_as_a_flush_finishes(self):
+        fs = HeldFS()
+        writer = fileio.WriteBehind(fs=fs, staging_dir=self.staging)
+        writer.save(self.path, b"first")
+        self.assertTrue(fs.flushing.wait(5))
+        staging = writer._staging_path(self.path)
+        real_replace = os.replace
+
+        def replace(source, destination):
+            real_replace(source, destination)
+            if destination == staging:
+                # Let the first flush finish right after the new copy is staged
+                fs.release.set()
+                time.sleep(0.2)
+
+        with mock.patch("os.replace", replace):
+            writer.save(self.path, b"second")
+        self.assertTrue(writer.wait(5))
+        self.assertEqual(writer.take_errors(), {})
+        self.assertEqual(self.read(), b"second")
+
+    def test_flush_keeps_the_target_mode(self):
+        with open(self.path, "wb") as file:
+            file.write(b"old")
+        os.chmod(self.path, 0o640)
+        writer = fileio.WriteBehind(staging_dir=self.staging)
+        writer.save(self.path, b"new")
+        self.assertTrue(writer.wait(5))
+        self.assertEqual(self.read(), b"new")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_staging_is_private(self):
+        writer = fileio.WriteBehind(fs=fileio.SlowFS(latency=0.2), staging_dir=self.staging)
+        writer.save(self.path, b"secret")
+        self.assertEqual(stat.S_IMODE(os.stat(self.staging).st_mode), 0o700)
+        for name in os.listdir(self.staging):
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.join(self.staging, name)).st_mode), 0o600)
+        self.assertTrue(writer.wait(5))
+
+    def test_compressed_paths_are_compressed(self):
+        path = self.path + ".gz"
+        writer = fileio.WriteBehind(staging_dir=self.staging)
+        writer.save(path, b"packed")
+        self.assertTrue(writer.wait(5))
+        self.assertEqual(gzip.decompress(self.read(path)), b"packed")
+
+
+if __name__ == "__main__":
+    unittest.main()
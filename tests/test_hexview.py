@@ -0,0 +1,53 @@
+"""
+Simply Note It - Hex view tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hexview
+
+
+class HexDocumentTests(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.write(handle, bytes(range(256)))
+        os.close(handle)
+        self.doc = hexview.HexDocument(self.path)
+
+    def tearDown(self):
+        self.doc.close()
+        os.unlink(self.path)
+
+    def test_read_sees_pending_overwrites(self):
+        self.doc.overwrite(40, 0xAA)
+        self.assertEqual(self.doc.read(32, 16)[8], 0xAA)
+        self.assertEqual(list(self.doc.edited(0, 32)), [])
+
+    def test_undo_and_overwrite_with_same_byte_drop_the_edit(self):
+        self.doc.overwrite(3, 0xFF)
+        self.doc.overwrite(7, 7)
+        self.doc.undo()
+        self.doc.undo()
+        self.assertEqual(self.doc.pending, {})
+
+    def test_save_writes_in_place(self):
+        self.doc.overwrite(17, 0)
+        self.assertEqual(self.doc.save(), 1)
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read()[17], 0)
+
+    def test_save_refuses_a_truncated_file(self):
+        self.doc.overwrite(200, 0)
+        os.truncate(self.path, 100)
+        with self.assertRaises(ValueError):
+            self.doc.save()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Simply Note It - Outline tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import outline
+
+SOURCE = """import os
+
+try:
+    import json
+except ImportError:
+    def loads(text):
+        pass
+else:
+    loads = json.loads
+finally:
+    pass
+
+if os.name == "nt":
+    def home():
+        pass
+elif os.name == "posix":
+    class Home:
+        def find(self):
+            pass
+else:
+    home = None
+
+@property
+def decorated():
+    pass
+"""
+
+
+class OutlineTests(unittest.TestCase):
+
+    def test_continuation_keywords_stay_in_their_block(self):
+        firsts = [first for first, _ in outline.split_blocks(SOURCE)]
+        self.assertEqual(firsts, [1, 3, 13, 23])
+
+    def test_symbols_inside_try_and_if(self):
+        symbols = outline.OutlineIndex().update(SOURCE)
+        self.assertEqual(symbols, [
+            ("function", "loads", 6, 0),
+            ("function", "home", 14, 0),
+            ("class", "Home", 17, 0),
+            ("method", "Home.find", 18, 1),
+            ("function", "decorated", 24, 0),
+        ])
+
+    def test_edit_reparses_only_changed_blocks(self):
+        index = outline.OutlineIndex()
+        index.update(SOURCE)
+        cached = dict(index.cache)
+        index.update(SOURCE.replace("def decorated", "def renamed"))
+        unchanged = [text for text in index.cache if text in cached]
+        self.assertEqual(len(unchanged), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
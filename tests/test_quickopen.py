@@ -0,0 +1,44 @@
+"""
+Simply Note It - Quick open tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quickopen
+
+
+def make_index(dirs):
+    index = quickopen.FileIndex(os.sep + "nonexistent")
+    index.dirs = {relative: [0, names, []] for relative, names in dirs.items()}
+    index._publish()
+    return index
+
+
+class FileIndexTests(unittest.TestCase):
+
+    def test_literal_matches_survive_the_candidate_limit(self):
+        # Many short paths match "main" only as a scattered subsequence of their names
+        noise = {"d": [f"xm{number}xa{number}xixn" for number in range(quickopen.SCORE_LIMIT * 2)]}
+        noise["mainline"] = ["entry_point_module.py"]
+        index = make_index(noise)
+        self.assertEqual(index.search("main", limit=1), [os.path.join("mainline", "entry_point_module.py")])
+
+    def test_narrowing_matches_a_fresh_search(self):
+        index = make_index({"": ["readme.md", "setup.py"], "docs": ["index.md", "reading.txt"]})
+        index.search("rea")
+        narrowed = index.search("read")
+        index.last_search = (None, None, None)
+        self.assertEqual(narrowed, index.search("read"))
+        self.assertEqual(sorted(narrowed), sorted(["readme.md", os.path.join("docs", "reading.txt")]))
+
+    def test_empty_query_lists_shortest_paths(self):
+        index = make_index({"": ["b.txt", "a.py"], "deep": ["c.md"]})
+        self.assertEqual(index.search("", limit=2), ["a.py", "b.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Simply Note It - Themes
+Themes are compiled once into Text widget options and tag configs so that
+switching is a single pass over the panels
+"""
+
+THEMES = {
+    "Light": {
+        "background": "white",
+        "foreground": "black",
+        "cursor": "black",
+        "selection": "lightblue",
+        "found": "yellow",
+        "muted": "gray",
+        "modified": "orange",
+        "error": "red",
+    },
+    "Dark": {
+        "background": "#1e1e1e",
+        "foreground": "#d4d4d4",
+        "cursor": "#aeafad",
+        "selection": "#264f78",
+        "found": "#613214",
+        "muted": "#808080",
+        "modified": "#c08000",
+        "error": "#f44747",
+    },
+}
+
+DEFAULT_THEME = "Light"
+FONT_FAMILY = "Consolas"
+FONT_SIZES = ["8", "9", "10", "11", "12", "14", "16", "18", "20", "24"]
+
+
+def compile_theme(name):
+    """Turn a theme into (widget options, {tag: tag options})"""
+    colors = THEMES[name]
+    widget = {
+        "tabs": ("2c", "4c", "6c", "8c"),
+        "background": colors["background"],
+        "foreground": colors["foreground"],
+        "insertbackground": colors["cursor"],
+        "selectbackground": colors["selection"],
+    }
+    tags = {
+        "found": {"background": colors["found"]},
+        "elided": {"foreground": colors["muted"], "underline": True},
+        "multicursor": {"background": colors["cursor"], "foreground": colors["background"]},
+        "folded": {"underline": True, "foreground": colors["muted"]},
+        "diagnostic_error": {"underline": True, "foreground": colors["error"]},
+        "diagnostic_warning": {"underline": True, "foreground": colors["modified"]},
+        "hexcursor": {"background": colors["selection"]},
+        "hexedited": {"foreground": colors["modified"]},
+    }
+    return widget, tags
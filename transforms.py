@@ -0,0 +1,220 @@
+"""
+Simply Note It - Line transforms
+Pure functions for bulk line edits and a line diff used to apply them as patches
+"""
+
+import difflib
+import re
+
+TAB_WIDTH = 4
+
+# Above this many changed lines in the middle of a diff we stop looking for
+# the smallest edit script and just replace the block
+DIFF_MATCHER_LIMIT = 20000
+
+# Above this many hunks it is cheaper for Tk to take one big replace
+MAX_HUNKS = 2000
+
+
+def split_lines(text):
+    """Split text into lines without line endings"""
+    return text.split("\n")
+
+
+def sort_lines(lines):
+    """Sort lines"""
+    return sorted(lines)
+
+
+def unique_lines(lines):
+    """Drop repeated lines, keeping the first occurrence"""
+    seen = set()
+    result = []
+    for line in lines:
+        if line not in seen:
+            seen.add(line)
+            result.append(line)
+    return result
+
+
+def trim_trailing(lines):
+    """Strip trailing whitespace from every line"""
+    return [line.rstrip() for line in lines]
+
+
+def _leading(line):
+    """Split a line into its leading whitespace and the rest"""
+    stripped = line.lstrip(" \t")
+    return line[:len(line) - len(stripped)], stripped
+
+
+def tabs_to_spaces(lines, tab_width=TAB_WIDTH):
+    """Expand tabs in leading indentation"""
+    result = []
+    for line in lines:
+        indent, rest = _leading(line)
+        result.append(indent.expandtabs(tab_width) + rest)
+    return result
+
+
+def spaces_to_tabs(lines, tab_width=TAB_WIDTH):
+    """Turn leading runs of spaces into tabs"""
+    result = []
+    for line in lines:
+        indent, rest = _leading(line)
+        width = len(indent.expandtabs(tab_width))
+        tabs, spaces = divmod(width, tab_width)
+        result.append("\t" * tabs + " " * spaces + rest)
+    return result
+
+
+def detect_indent(lines, tab_width=TAB_WIDTH):
+    """Guess the indent unit of a block of lines"""
+    unit = 0
+    for line in lines:
+        indent, rest = _leading(line)
+        if not rest:
+            continue
+        width = len(indent.expandtabs(tab_width))
+        if width:
+            unit = width if not unit else _gcd(unit, width)
+            if unit == 1:
+                break
+    return unit or tab_width
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def reindent(lines, width=TAB_WIDTH, tab_width=TAB_WIDTH):
+    """Rescale leading indentation to multiples of width spaces"""
+    unit = detect_indent(lines, tab_width)
+    result = []
+    for line in lines:
+        indent, rest = _leading(line)
+        if not rest:
+            result.append("")
+            continue
+        levels, extra = divmod(len(indent.expandtabs(tab_width)), unit)
+        result.append(" " * (levels * width + extra) + rest)
+    return result
+
+
+def replace_all(text, pattern, replacement, regex=False, ignore_case=False):
+    """Replace every match of pattern in text, returning (text, count)"""
+    if not regex:
+        if not ignore_case:
+            return text.replace(pattern, replacement), text.count(pattern)
+        pattern = re.escape(pattern)
+        replacement = replacement.replace("\\", "\\\\")
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.subn(pattern, replacement, text, flags=flags)
+
+
+TRANSFORMS = {
+    "sort": sort_lines,
+    "unique": unique_lines,
+    "trim": trim_trailing,
+    "reindent": reindent,
+    "tabs-to-spaces": tabs_to_spaces,
+    "spaces-to-tabs": spaces_to_tabs,
+}
+
+
+def apply_transform(name, text):
+    """Run a named transform over text, keeping a final newline if present"""
+    trailing = text.endswith("\n")
+    lines = split_lines(text[:-1] if trailing else text)
+    result = "\n".join(TRANSFORMS[name](lines))
+    return result + "\n" if trailing else result
+
+
+def _keepends(text):
+    """Split text into lines that keep their newline"""
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _subsequence_hunks(old, new, offset):
+    """Hunks for a new list that only deletes lines from old, or None"""
+    hunks = []
+    j = 0
+    run_start = None
+    for i, line in enumerate(old):
+        if j < len(new) and line == new[j]:
+            if run_start is not None:
+                hunks.append((offset + run_start, offset + i, []))
+                run_start = None
+            j += 1
+        elif run_start is None:
+            run_start = i
+    if j != len(new):
+        return None
+    if run_start is not None:
+        hunks.append((offset + run_start, offset + len(old), []))
+    return hunks
+
+
+def line_diff(old_text, new_text):
+    """
+    Compute hunks turning old_text into new_text.
+
+    Each hunk is (start, end, lines): old lines [start, end) are replaced by
+    lines, which keep their newlines. Hunks are sorted and do not overlap.
+    """
+    old = _keepends(old_text)
+    new = _keepends(new_text)
+
+    # Trim the common prefix and suffix, which is usually most of the file
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    if not old_mid and not new_mid:
+        return []
+
+    hunks = None
+    if len(old_mid) == len(new_mid):
+        # Line-for-line edits (trim, reindent, sort): group changed runs
+        hunks = []
+        start = None
+        for i, (a, b) in enumerate(zip(old_mid, new_mid)):
+            if a != b:
+                if start is None:
+                    start = i
+            elif start is not None:
+                hunks.append((prefix + start, prefix + i, new_mid[start:i]))
+                start = None
+        if start is not None:
+            hunks.append((prefix + start, prefix + len(old_mid), new_mid[start:]))
+    elif len(new_mid) < len(old_mid):
+        # Unique lines only ever deletes, which is a linear walk
+        hunks = _subsequence_hunks(old_mid, new_mid, prefix)
+
+    if hunks is None:
+        if len(old_mid) + len(new_mid) <= DIFF_MATCHER_LIMIT:
+            matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+            hunks = [
+                (prefix + i1, prefix + i2, new_mid[j1:j2])
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+                if tag != "equal"
+            ]
+        else:
+            hunks = [(prefix, prefix + len(old_mid), new_mid)]
+
+    if len(hunks) > MAX_HUNKS:
+        first, last = hunks[0][0], hunks[-1][1]
+        hunks = [(first, last, new[first:len(new) - (len(old) - last)])]
+    return hunks